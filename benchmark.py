@@ -0,0 +1,428 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
+
+from maze.maze import Maze
+from maze.maze_generator import MazeGenerator
+from ai.bfs import BFS
+from ai.astar import AStar
+from ai.flat_astar import FlatAStar
+from ai.bidirectional import BidirectionalBFS, BidirectionalAStar
+from ai.jps import JumpPointSearch
+from ai.distance_field import DistanceField, get_distance_field
+from ai.dstar_lite import DStarLite
+from ai.hpa import HierarchicalPathfinder
+from ai.corridor_graph import CorridorGraph
+from ai.ai_controller import AIController
+from ai.multi_agent import MultiAgentController
+from ai.async_planner import AsyncPlanner
+from ai.cooperative import CooperativePlanner
+from ai.registry import SOLVERS, create_solver, maze_features
+from config.settings import AI_UPDATE_RATE, SOLVER_CALIBRATION
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+def print_table(header, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    for row in [header] + rows:
+        print("  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)))
+
+def braid(maze: Maze, fraction: float, seed: int = 0) -> Maze:
+    """Knock out a fraction of the inner walls to add loops and open areas"""
+    rng = random.Random(seed)
+    for y in range(1, maze.height - 1):
+        for x in range(1, maze.width - 1):
+            if maze.is_wall(x, y) and rng.random() < fraction:
+                maze.set_cell(x, y, 0)
+    return maze
+
+def solver_mazes(size: int):
+    perfect = MazeGenerator(size, size, seed=size).generate_maze()
+    braided = braid(MazeGenerator(size, size, seed=size).generate_maze(), 0.1)
+    yield "perfect", perfect
+    yield "braided", braided
+
+def measure_solver(solver, start, goal):
+    """Return (seconds, nodes expanded, peak bytes allocated) for one call"""
+    solver.find_path(start, goal)  # Warm up indexes and preallocated arrays
+    elapsed = time_call(solver.find_path, start, goal)
+    tracemalloc.start()
+    solver.find_path(start, goal)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, getattr(solver, "nodes_expanded", "-"), peak
+
+# Reference implementations kept as they were before the optimizations,
+# so every benchmark compares against the original code
+
+def legacy_kruskal(maze: Maze):
+    maze.fill(1)
+    
+    edges = []
+    for y in range(1, maze.height - 1, 2):
+        for x in range(1, maze.width - 1, 2):
+            if x + 2 < maze.width:
+                edges.append(((x, y), (x + 2, y)))
+            if y + 2 < maze.height:
+                edges.append(((x, y), (x, y + 2)))
+    
+    random.shuffle(edges)
+    
+    parent = {}
+    rank = {}
+    
+    def find(x):
+        if x not in parent:
+            parent[x] = x
+            rank[x] = 0
+        if parent[x] != x:
+            parent[x] = find(parent[x])
+        return parent[x]
+    
+    def union(x, y):
+        px, py = find(x), find(y)
+        if px == py:
+            return False
+        if rank[px] < rank[py]:
+            parent[px] = py
+        elif rank[px] > rank[py]:
+            parent[py] = px
+        else:
+            parent[py] = px
+            rank[px] += 1
+        return True
+    
+    for (x1, y1), (x2, y2) in edges:
+        if union((x1, y1), (x2, y2)):
+            maze.set_cell((x1 + x2) // 2, (y1 + y2) // 2, 0)
+            maze.set_cell(x1, y1, 0)
+            maze.set_cell(x2, y2, 0)
+
+def bench_kruskal(sizes, legacy_limit):
+    print("=== Kruskal generation ===")
+    rows = []
+    for size in sizes:
+        generator = MazeGenerator(size, size)
+        new_time = time_call(generator._kruskal_algorithm, Maze(size, size))
+        if size <= legacy_limit:
+            old_time = time_call(legacy_kruskal, Maze(size, size))
+            rows.append((f"{size}x{size}", f"{old_time:.3f}s", f"{new_time:.3f}s",
+                         f"{old_time / new_time:.1f}x"))
+        else:
+            rows.append((f"{size}x{size}", "skipped", f"{new_time:.3f}s", "-"))
+    print_table(("size", "legacy", "array", "speedup"), rows)
+
+def bench_prim(sizes, legacy_limit):
+    print("=== Prim generation (linear scaling) ===")
+    rows = []
+    for size in sizes:
+        elapsed = time_call(MazeGenerator(size, size)._prim_algorithm, Maze(size, size))
+        cells = (size // 2) ** 2
+        rows.append((f"{size}x{size}", cells, f"{elapsed:.3f}s",
+                     f"{elapsed / cells * 1e6:.2f}us"))
+    print_table(("size", "cells", "time", "per cell"), rows)
+
+def bench_astar(sizes, legacy_limit):
+    print("=== A*: dict/tuple engine vs flat-index engine ===")
+    rows = []
+    for size in sizes:
+        for kind, maze in solver_mazes(size):
+            start, goal = maze.get_start_position(), maze.get_goal_position()
+            for name, solver in (("AStar", AStar(maze)), ("FlatAStar", FlatAStar(maze))):
+                elapsed, expanded, peak = measure_solver(solver, start, goal)
+                rows.append((f"{size}x{size}", kind, name, f"{elapsed * 1000:.1f}ms",
+                             expanded, f"{peak / 1024:.0f}KiB"))
+    print_table(("size", "maze", "solver", "time", "expanded", "peak alloc"), rows)
+
+def bench_bidirectional(sizes, legacy_limit):
+    print("=== Unidirectional vs bidirectional search ===")
+    rows = []
+    for size in sizes:
+        for kind, maze in solver_mazes(size):
+            start, goal = maze.get_start_position(), maze.get_goal_position()
+            solvers = (("BFS", BFS(maze)), ("BidirectionalBFS", BidirectionalBFS(maze)),
+                       ("AStar", AStar(maze)), ("BidirectionalAStar", BidirectionalAStar(maze)))
+            for name, solver in solvers:
+                elapsed, expanded, peak = measure_solver(solver, start, goal)
+                rows.append((f"{size}x{size}", kind, name, f"{elapsed * 1000:.1f}ms",
+                             expanded, f"{peak / 1024:.0f}KiB"))
+    print_table(("size", "maze", "solver", "time", "expanded", "peak alloc"), rows)
+
+def bench_jps(sizes, legacy_limit):
+    print("=== A* vs Jump Point Search ===")
+    rows = []
+    for size in sizes:
+        mazes = list(solver_mazes(size))
+        mazes.append(("open", braid(MazeGenerator(size, size, seed=size).generate_maze(), 0.5)))
+        for kind, maze in mazes:
+            start, goal = maze.get_start_position(), maze.get_goal_position()
+            for name, solver in (("AStar", AStar(maze)), ("JumpPointSearch", JumpPointSearch(maze))):
+                elapsed, expanded, peak = measure_solver(solver, start, goal)
+                rows.append((f"{size}x{size}", kind, name, f"{elapsed * 1000:.1f}ms",
+                             expanded, f"{peak / 1024:.0f}KiB"))
+    print_table(("size", "maze", "solver", "time", "expanded", "peak alloc"), rows)
+
+def bench_field(sizes, legacy_limit, replans=10):
+    print(f"=== Distance field vs A* for {replans} replans from random cells ===")
+    rows = []
+    for size in sizes:
+        for kind, maze in solver_mazes(size):
+            goal = maze.get_goal_position()
+            rng = random.Random(size)
+            cells = [(x, y) for y in range(size) for x in range(size) if maze.is_path(x, y)]
+            starts = [rng.choice(cells) for _ in range(replans)]
+            
+            maze.neighbor_masks()  # Shared by both, keep it out of the timings
+            build = time_call(DistanceField, maze, goal)
+            astar = AStar(maze)
+            astar_time = time_call(lambda: [astar.find_path(start, goal) for start in starts])
+            field = get_distance_field(maze, goal)
+            step_time = time_call(lambda: [field.next_step(*start) for start in starts])
+            rows.append((f"{size}x{size}", kind, f"{build * 1000:.1f}ms",
+                         f"{astar_time * 1000:.1f}ms", f"{step_time * 1e6:.1f}us"))
+    print_table(("size", "maze", "field build", "A* replans", "field replans"), rows)
+
+def bench_dstar(sizes, legacy_limit, replans=30):
+    print(f"=== D* Lite repairs vs A* from scratch, {replans} wall toggles near the agent ===")
+    rows = []
+    for size in sizes:
+        maze = braid(MazeGenerator(size, size, seed=size).generate_maze(), 0.1)
+        goal = maze.get_goal_position()
+        rng = random.Random(size)
+        dstar, astar = DStarLite(maze), AStar(maze)
+        pos = maze.get_start_position()
+        initial = time_call(dstar.find_path, pos, goal)
+        
+        repair_time = astar_time = expanded = done = 0
+        while done < replans:
+            x = min(size - 2, max(1, pos[0] + rng.randint(-6, 6)))
+            y = min(size - 2, max(1, pos[1] + rng.randint(-6, 6)))
+            if (x, y) == pos or (x, y) == goal:
+                continue
+            maze.set_cell(x, y, 0 if maze.is_wall(x, y) else 1)
+            
+            start = time.perf_counter()
+            path = dstar.find_path(pos, goal)
+            repair_time += time.perf_counter() - start
+            expanded += dstar.nodes_expanded
+            astar_time += time_call(astar.find_path, pos, goal)
+            if not path:
+                maze.set_cell(x, y, 0)  # Keep the goal reachable
+                continue
+            pos = path[min(len(path) - 1, 2)]
+            done += 1
+        
+        rows.append((f"{size}x{size}", f"{initial * 1000:.0f}ms", f"{repair_time / done * 1000:.1f}ms",
+                     expanded // done, f"{astar_time / done * 1000:.1f}ms"))
+    print_table(("size", "initial", "repair", "expanded", "A* replan"), rows)
+
+def bench_hpa(sizes, legacy_limit):
+    print("=== HPA* (16x16 clusters) vs A* ===")
+    rows = []
+    for size in sizes:
+        for kind, maze in solver_mazes(size):
+            start, goal = maze.get_start_position(), maze.get_goal_position()
+            build_start = time.perf_counter()
+            hpa = HierarchicalPathfinder(maze)
+            build = time.perf_counter() - build_start
+            query = time_call(hpa.find_path, start, goal)
+            path = hpa.find_path(start, goal)
+            shortest = AStar(maze).find_path(start, goal)
+            astar = time_call(AStar(maze).find_path, start, goal)
+            
+            # Toggle one cell on the path and bring the graph up to date
+            x, y = path[len(path) // 2]
+            maze.set_cell(x, y, 1)
+            update = time_call(hpa.update)
+            rows.append((f"{size}x{size}", kind, f"{build:.2f}s", f"{query * 1000:.0f}ms",
+                         f"{astar * 1000:.0f}ms", f"{len(path) / len(shortest):.3f}",
+                         f"{update * 1000:.1f}ms"))
+    print_table(("size", "maze", "build", "query", "A* query", "length ratio", "update"), rows)
+
+def bench_corridor(sizes, legacy_limit):
+    print("=== Corridor graph (dead ends filled, corridors contracted) vs A* ===")
+    rows = []
+    for size in sizes:
+        for kind, maze in solver_mazes(size):
+            start, goal = maze.get_start_position(), maze.get_goal_position()
+            build_start = time.perf_counter()
+            graph = CorridorGraph(maze)
+            build = time.perf_counter() - build_start
+            query = time_call(graph.find_path, start, goal)
+            astar = AStar(maze)
+            astar_time = time_call(astar.find_path, start, goal)
+            rows.append((f"{size}x{size}", kind, graph.core_cells, len(graph.adjacent), f"{build:.2f}s",
+                         f"{query * 1000:.1f}ms", graph.nodes_expanded,
+                         f"{astar_time * 1000:.0f}ms", astar.nodes_expanded))
+    print_table(("size", "maze", "core cells", "junctions", "build", "query", "expanded",
+                 "A* query", "A* expanded"), rows)
+
+def bench_agents(sizes, legacy_limit, counts=(10, 100, 1000), ticks=20):
+    print(f"=== {ticks} AI ticks: one AIController per agent vs MultiAgentController ===")
+    rows = []
+    for size in sizes:
+        maze = braid(MazeGenerator(size, size, seed=size).generate_maze(), 0.1)
+        rng = random.Random(size)
+        cells = [(x, y) for y in range(size) for x in range(size) if maze.is_path(x, y)]
+        for count in counts:
+            starts = [rng.choice(cells) for _ in range(count)]
+            multi = MultiAgentController(maze, starts)
+            batched = time_call(lambda: [multi.update() for _ in range(ticks * AI_UPDATE_RATE)])
+            
+            # Solvers are built on first use, so field controllers only share the field
+            controllers = [AIController(maze, "field") for _ in starts]
+            for controller, start in zip(controllers, starts):
+                controller.reset(start)
+            elapsed = time_call(lambda: [controller.update() for _ in range(ticks * AI_UPDATE_RATE)
+                                         for controller in controllers])
+            assert multi.get_positions() == [controller.get_position() for controller in controllers]
+            rows.append((f"{size}x{size}", count, f"{elapsed / ticks * 1000:.2f}ms",
+                         f"{batched / ticks * 1000:.2f}ms", f"{elapsed / batched:.0f}x"))
+    print_table(("size", "agents", "per-agent tick", "batched tick", "speedup"), rows)
+
+def bench_planner(sizes, legacy_limit, jobs=8):
+    print(f"=== Game-loop time to get {jobs} A* plans: inline vs thread / process pools ===")
+    rows = []
+    for size in sizes:
+        maze = braid(MazeGenerator(size, size, seed=size).generate_maze(), 0.1)
+        rng = random.Random(size)
+        cells = [(x, y) for y in range(size) for x in range(size) if maze.is_path(x, y)]
+        queries = [(rng.choice(cells), rng.choice(cells)) for _ in range(jobs)]
+        astar = AStar(maze)
+        inline = time_call(lambda: [astar.find_path(start, goal) for start, goal in queries])
+        rows.append((f"{size}x{size}", "inline", "-", f"{inline * 1000:.0f}ms", "-", "-"))
+        
+        for kind in ("thread", "process"):
+            planner = AsyncPlanner(kind, max_workers=4)  # Latencies include worker start-up
+            start_time = time.perf_counter()
+            futures = [planner.submit(astar.find_path, start, goal) for start, goal in queries]
+            submit = time.perf_counter() - start_time
+            for future in futures:
+                future.result()
+            total = time.perf_counter() - start_time
+            planner.shutdown()
+            rows.append((f"{size}x{size}", kind, f"{submit * 1000:.1f}ms", f"{total * 1000:.0f}ms",
+                         f"{planner.mean_latency * 1000:.0f}ms", f"{planner.max_latency * 1000:.0f}ms"))
+    print_table(("size", "planner", "game-loop cost", "all done", "mean latency", "max latency"), rows)
+
+def bench_cooperative(sizes, legacy_limit, counts=(10, 100, 1000), steps=100):
+    print(f"=== {steps} steps of cooperative planning vs independent agents ===")
+    rows = []
+    for size in sizes:
+        maze = braid(MazeGenerator(size, size, seed=size).generate_maze(), 0.1)
+        rng = random.Random(size)
+        # One connected component, so every goal is reachable
+        field = get_distance_field(maze, maze.get_goal_position())
+        cells = [(x, y) for y in range(size) for x in range(size) if field.distance(x, y) >= 0]
+        for count in counts:
+            if count > len(cells):
+                # Every agent needs a cell of its own to start and finish on
+                rows.append((f"{size}x{size}", count, "-", "-", f"only {len(cells)} cells", "-", "-", "-"))
+                continue
+            starts, goals = rng.sample(cells, count), rng.sample(cells, count)
+            
+            planner = CooperativePlanner(maze, starts, goals)
+            moves = largest_table = 0
+            start_time = time.perf_counter()
+            for _ in range(steps):
+                before = list(planner.positions)
+                planner.step()
+                moves += sum(old != new for old, new in zip(before, planner.positions))
+                largest_table = max(largest_table, len(planner.table))
+            elapsed = time.perf_counter() - start_time
+            arrived = planner.active.count(False)
+            
+            # The same agents ignoring each other: ticks where two share a cell
+            independent = MultiAgentController(maze, starts, goals)
+            collisions = 0
+            for _ in range(steps):
+                independent.step()
+                moving = [position for position, done in zip(independent.get_positions(),
+                                                             independent.arrived()) if not done]
+                collisions += len(moving) - len(set(moving))
+            
+            rows.append((f"{size}x{size}", count, f"{elapsed / steps * 1000:.2f}ms",
+                         f"{moves / elapsed:.0f}", arrived, planner.blocked_moves,
+                         largest_table, collisions))
+    print_table(("size", "agents", "step", "moves/s", "arrived", "blocked",
+                 "table max", "independent collisions"), rows)
+
+def bench_calibrate(sizes, legacy_limit, fractions=(0.0, 0.1, 0.5), queries=5):
+    print(f"=== Solver calibration for \"auto\" (written to {SOLVER_CALIBRATION}) ===")
+    names = [name for name, spec in SOLVERS.items() if spec.auto]
+    points, rows = [], []
+    for size in sizes:
+        for fraction in fractions:
+            maze = braid(MazeGenerator(size, size, seed=size).generate_maze(), fraction)
+            rng = random.Random(size)
+            cells = [(x, y) for y in range(size) for x in range(size) if maze.is_path(x, y)]
+            pairs = [(maze.get_start_position(), maze.get_goal_position())]
+            pairs += [(rng.choice(cells), rng.choice(cells)) for _ in range(queries - 1)]
+            maze.neighbor_masks()  # Shared by every solver, keep it out of the timings
+            
+            timings = {}
+            for name in names:
+                start_time = time.perf_counter()
+                solver = create_solver(name, maze)
+                build = time.perf_counter() - start_time
+                query = sum(time_call(solver.find_path, start, goal) for start, goal in pairs) / len(pairs)
+                timings[name] = {"build": round(build, 6), "query": round(query, 6)}
+            
+            cell_count, density = maze_features(maze)
+            points.append({"cells": cell_count, "density": round(density, 4), "solvers": timings})
+            fastest = min(names, key=lambda name: timings[name]["query"])
+            rows.append((f"{size}x{size}", f"{density:.3f}", fastest,
+                         f"{timings[fastest]['query'] * 1000:.2f}ms",
+                         f"{timings['astar']['query'] * 1000:.2f}ms"))
+    print_table(("size", "density", "fastest query", "time", "A* time"), rows)
+    
+    with open(SOLVER_CALIBRATION, "w") as file:
+        json.dump({"queries": queries, "points": points}, file, indent=1)
+
+BENCHMARKS = {
+    "kruskal": (bench_kruskal, [100, 1000, 4000]),
+    "prim": (bench_prim, [125, 250, 500, 1000, 2000, 4000]),
+    "astar": (bench_astar, [101, 501, 1001]),
+    "bidirectional": (bench_bidirectional, [501, 1001]),
+    "jps": (bench_jps, [501, 1001]),
+    "field": (bench_field, [501, 1001]),
+    "dstar": (bench_dstar, [201, 501, 1001]),
+    "hpa": (bench_hpa, [501, 1001]),
+    "corridor": (bench_corridor, [501, 1001]),
+    "agents": (bench_agents, [201, 501]),
+    "planner": (bench_planner, [501, 1001]),
+    "cooperative": (bench_cooperative, [201]),
+    "calibrate": (bench_calibrate, [51, 101, 201, 501]),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Maze Runner AI - Benchmarks")
+    parser.add_argument("names", nargs="*",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all but calibrate)")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help="maze side lengths (default: per benchmark)")
+    parser.add_argument("--legacy-limit", type=int, default=4000,
+                        help="largest size to run the legacy implementations on")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    
+    # Calibrating rewrites the data "auto" reads, so it only runs when named
+    for name in args.names or [name for name in BENCHMARKS if name != "calibrate"]:
+        random.seed(args.seed)
+        bench, default_sizes = BENCHMARKS[name]
+        bench(args.sizes or default_sizes, args.legacy_limit)
+        print()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
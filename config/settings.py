@@ -1,3 +1,5 @@
+import os
+
 # Window settings
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -25,10 +27,18 @@ AI_SPEED = 3
 
 # AI settings
 AI_UPDATE_RATE = 10  # AI updates every N frames
-AI_ALGORITHM = "astar"  # "bfs", "astar", "dfs"
+AI_ALGORITHM = "astar"  # "auto", "bfs", "bfs_bidir", "astar", "astar_bidir", "astar_flat", "jps", "corridor", "hpa", "field", "dstar", "dfs"
+SOLVER_CALIBRATION = os.path.join(os.path.dirname(__file__), "solver_calibration.json")  # Written by benchmark.py calibrate
+PATH_CACHE_ENTRIES = 256  # Paths kept in the shared cache
+PATH_CACHE_CELLS = 1_000_000  # Total cells across all cached paths
+PLANNING_BUDGET = None  # A* expansions per frame before the rest waits for the next frame, e.g. 2000 (None: no limit)
+PLANNING_TIME_BUDGET = None  # Milliseconds of A* per frame, e.g. 4 (None: no limit)
+PLANNER_EXECUTOR = None  # None (plan in the game loop), "thread" or "process"
+PLANNER_WORKERS = 2  # Pool size when PLANNER_EXECUTOR is set
 
 # Maze generation
-MAZE_GENERATION_ALGORITHM = "recursive_backtracking"  # "kruskal", "prim", "recursive_backtracking"
+MAZE_GENERATION_ALGORITHM = "recursive_backtracking"  # "kruskal", "prim", "eller", "recursive_backtracking"
+START_GOAL_PLACEMENT = "corners"  # "corners", "max_difficulty"
 
 # UI settings
 FONT_SIZE = 24
@@ -1,21 +1,43 @@
 import random
+import time
 from typing import List, Tuple, Optional
 
-from config.settings import AI_UPDATE_RATE, AI_SPEED
+from config.settings import AI_UPDATE_RATE, AI_SPEED, PATH_CACHE_ENTRIES, PATH_CACHE_CELLS
 from maze.maze import Maze
-from ai.bfs import BFS
-from ai.astar import AStar
-from ai.dfs import DFS
+from ai.registry import SOLVERS, create_solver, choose_solver
+from ai.distance_field import get_distance_field
+from ai.path_cache import PathCache
+from ai.async_planner import AsyncPlanner
+
+# Shared by every controller unless one is given its own cache
+shared_path_cache = PathCache(PATH_CACHE_ENTRIES, PATH_CACHE_CELLS)
+
+# Planner jobs build their own solver: solvers keep per-search state, and
+# a stale job may still be running when the next one starts. Module-level
+# so process pools can pickle them.
+def _find_path_job(name: str, maze: Maze, start: Tuple[int, int],
+                   goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    return create_solver(name, maze).find_path(start, goal)
+
+def _alternative_path_job(maze: Maze, start: Tuple[int, int],
+                          goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    return create_solver("dfs", maze).find_alternative_path(start, goal, set())
 
 class AIController:
-    def __init__(self, maze: Maze, algorithm: str = "astar"):
+    def __init__(self, maze: Maze, algorithm: str = "astar", path_cache: Optional[PathCache] = None,
+                 planner: Optional[AsyncPlanner] = None, planning_budget: Optional[int] = None,
+                 planning_time_budget: Optional[float] = None):
         self.maze = maze
         self.algorithm = algorithm
+        self.path_cache = path_cache if path_cache is not None else shared_path_cache
+        self.planner = planner  # Plans off the game loop when given
+        # A* expansions / milliseconds per frame; with neither, A* plans in one go
+        self.planning_budget = planning_budget
+        self.planning_time_budget = planning_time_budget
         
-        # Initialize algorithms
-        self.bfs = BFS(maze)
-        self.astar = AStar(maze)
-        self.dfs = DFS(maze)
+        # Registered solvers by name, each built on first use
+        self.solvers = {}
+        self.auto_choice = None  # (maze version, solver name) picked for "auto"
         
         # AI state
         self.current_pos = maze.get_start_position()
@@ -23,6 +45,11 @@ class AIController:
         self.path = []
         self.path_index = 0
         self.update_counter = 0
+        self.field = None  # Shared distance field when algorithm is "field"
+        self.search = None  # A* search still being spread over frames
+        self.finished_search = None  # Completed one, cached on the following frame
+        self.pending_path = None  # (future, maze version, solver name, shortest) from the planner
+        self.pending_alternative = None  # (future, maze version) of a DFS detour
         
         # AI behavior
         self.stuck_counter = 0
@@ -34,13 +61,24 @@ class AIController:
     
     def update(self):
         self.update_counter += 1
+        if self.planner is not None:
+            self._collect_plans()
+        
+        # Planning gets its budget every frame, moves only every N frames
+        if self.finished_search is not None:
+            # Indexing a long path in the cache costs about as much as a frame's search
+            search, self.finished_search = self.finished_search, None
+            if search.version == self.maze.version:
+                self.path_cache.put(self.maze, "astar", search.start, search.goal, search.path)
+        elif self.search is not None:
+            self._continue_planning(follow=self.update_counter % AI_UPDATE_RATE == 0)
         
         # Only update AI every N frames
         if self.update_counter % AI_UPDATE_RATE != 0:
             return
         
-        # Check if stuck
-        if self.current_pos == self.last_pos:
+        # Check if stuck; waiting for a plan does not count
+        if self.current_pos == self.last_pos and not self._waiting():
             self.stuck_counter += 1
         else:
             self.stuck_counter = 0
@@ -57,17 +95,136 @@ class AIController:
         self.explored_areas.add(self.current_pos)
     
     def _calculate_path(self):
-        if self.algorithm == "bfs":
-            self.path = self.bfs.find_path(self.current_pos, self.goal_pos)
-        elif self.algorithm == "astar":
-            self.path = self.astar.find_path(self.current_pos, self.goal_pos)
-        elif self.algorithm == "dfs":
-            self.path = self.dfs.find_path(self.current_pos, self.goal_pos)
-        else:
-            # Default to A*
-            self.path = self.astar.find_path(self.current_pos, self.goal_pos)
-        
         self.path_index = 0
+        self.search = None
+        self._cancel_pending()
+        if self.algorithm == "field":
+            # No path to plan: each move reads the next step from the field
+            self.field = get_distance_field(self.maze, self.goal_pos)
+            self.path = []
+            return
+        if self.algorithm == "dstar":
+            # Keeps its search state and repairs it after maze edits
+            self.path = self.solver("dstar").find_path(self.current_pos, self.goal_pos)
+            return
+        
+        name = self._solver_name()
+        if name == "astar" and self.planner is None and (self.planning_budget or self.planning_time_budget):
+            self._start_planning()
+            return
+        
+        # Solvers whose paths are not shortest (DFS, HPA*) only reuse exact repeats
+        shortest = SOLVERS[name].shortest
+        if self.planner is not None:
+            self._submit_path(name, shortest)
+            return
+        self.path = self.path_cache.find_path(self.maze, name, self.solver(name),
+                                              self.current_pos, self.goal_pos, shortest)
+    
+    def solver(self, name: str):
+        """The registered solver called name, created on first use"""
+        if name not in self.solvers:
+            self.solvers[name] = create_solver(name, self.maze)
+        return self.solvers[name]
+    
+    def _solver_name(self) -> str:
+        if self.algorithm == "auto":
+            # Calibration lookups read the whole maze, so redo them only after edits
+            if self.auto_choice is None or self.auto_choice[0] != self.maze.version:
+                self.auto_choice = (self.maze.version, choose_solver(self.maze))
+            return self.auto_choice[1]
+        if self.algorithm in SOLVERS:
+            return self.algorithm
+        # Default to A*
+        return "astar"
+    
+    def _submit_path(self, name: str, shortest: bool):
+        path = self.path_cache.get(self.maze, name, self.current_pos, self.goal_pos)
+        if path is not None:
+            self.path = path
+            return
+        # The agent waits where it is until the plan arrives on a later tick
+        self.path = []
+        future = self.planner.submit(_find_path_job, name, self.maze, self.current_pos, self.goal_pos)
+        self.pending_path = (future, self.maze.version, name, shortest)
+    
+    def _collect_plans(self):
+        """Apply planner results that have arrived since the last tick"""
+        if self.pending_path is not None and self.pending_path[0].done():
+            future, version, name, shortest = self.pending_path
+            self.pending_path = None
+            if version != self.maze.version:
+                self._calculate_path()  # Planned against walls that have changed since
+            else:
+                self.path = future.result()
+                self.path_index = 0
+                self.path_cache.put(self.maze, name, self.current_pos, self.goal_pos,
+                                    self.path, shortest)
+        
+        if self.pending_alternative is not None and self.pending_alternative[0].done():
+            future, version = self.pending_alternative
+            self.pending_alternative = None
+            alternative_path = future.result()
+            if version == self.maze.version and alternative_path and len(alternative_path) > 1:
+                self.path = alternative_path
+                self.path_index = 0
+            else:
+                # The strategies _handle_stuck_situation would have tried next
+                self._try_exploration() or self._try_random_movement()
+    
+    def _cancel_pending(self):
+        for pending in (self.pending_path, self.pending_alternative):
+            if pending is not None:
+                self.planner.cancel(pending[0])
+        self.pending_path = self.pending_alternative = None
+    
+    def _waiting(self) -> bool:
+        """True while a plan is still being computed"""
+        return (self.search is not None or self.pending_path is not None
+                or self.pending_alternative is not None)
+    
+    def _start_planning(self):
+        path = self.path_cache.get(self.maze, "astar", self.current_pos, self.goal_pos)
+        if path is not None:
+            self.path = path
+            return
+        self.search = self.solver("astar").search(self.current_pos, self.goal_pos)
+        self.path = []
+        self._continue_planning()
+    
+    def _continue_planning(self, follow: bool = True):
+        """Spend one frame's budget on the plan; `follow` also re-routes the agent"""
+        deadline = None
+        if self.planning_time_budget:
+            deadline = time.perf_counter() + self.planning_time_budget / 1000
+        if self.search.version != self.maze.version:
+            # Planned against walls that have changed since
+            self.search = self.solver("astar").search(self.current_pos, self.goal_pos)
+        
+        # Re-routing walks the whole partial path, so it shares the frame's time budget
+        if follow:
+            self._follow_search()
+        search = self.search
+        if search is None:
+            return
+        search.step(self.planning_budget or None, deadline)
+        if search.done:
+            self._follow_search()
+            self.search = None
+            self.finished_search = search
+    
+    def _follow_search(self):
+        # Partial and final paths share the search tree, so the agent can rejoin them
+        search = self.search
+        route = search.route(self.current_pos, search.partial_path())
+        if route is None:
+            # Wandered off the tree (a random move), plan again from here
+            self.search = self.solver("astar").search(self.current_pos, self.goal_pos)
+            route = [self.current_pos]
+        elif search.done and not search.found:
+            route = []
+        self.path = route
+        self.path_index = min(1, len(route))  # route[0] is where the agent stands
     
     def _handle_stuck_situation(self):
         # Try different strategies
@@ -82,8 +239,16 @@ class AIController:
                 break
     
     def _try_alternative_path(self) -> bool:
+        if self.planner is not None:
+            # The detour is applied, or the next strategy tried, once it arrives
+            if self.pending_alternative is None:
+                future = self.planner.submit(_alternative_path_job, self.maze,
+                                             self.current_pos, self.goal_pos)
+                self.pending_alternative = (future, self.maze.version)
+            return True
+        
         # Use DFS to find alternative path
-        alternative_path = self.dfs.find_alternative_path(
+        alternative_path = self.solver("dfs").find_alternative_path(
             self.current_pos, self.goal_pos, set()
         )
         
@@ -96,7 +261,7 @@ class AIController:
     
     def _try_exploration(self) -> bool:
         # Find unexplored neighbors
-        neighbors = self.maze.get_neighbors(*self.current_pos)
+        neighbors = self.maze.iter_neighbors(*self.current_pos)
         unexplored = [n for n in neighbors if n not in self.explored_areas]
         
         if unexplored:
@@ -109,7 +274,7 @@ class AIController:
         return False
     
     def _try_random_movement(self) -> bool:
-        neighbors = self.maze.get_neighbors(*self.current_pos)
+        neighbors = self.maze.iter_neighbors(*self.current_pos)
         
         if neighbors:
             next_pos = random.choice(neighbors)
@@ -120,6 +285,13 @@ class AIController:
         return False
     
     def _move_along_path(self):
+        if self.algorithm == "field" and self.path_index >= len(self.path):
+            self._move_along_field()
+            return
+        if self.algorithm == "dstar" and self.solver("dstar").version != self.maze.version:
+            # Repairs are cheap, so pick up new shortcuts as well as blockages
+            self._calculate_path()
+        
         if self.path_index < len(self.path):
             next_pos = self.path[self.path_index]
             
@@ -131,15 +303,22 @@ class AIController:
                 # Path is no longer valid, recalculate
                 self._calculate_path()
     
+    def _move_along_field(self):
+        # Cheap when the maze is unchanged; rebuilt once if it was edited
+        self.field = get_distance_field(self.maze, self.goal_pos)
+        next_pos = self.field.next_step(*self.current_pos)
+        if next_pos is not None:
+            self.current_pos = next_pos
+    
     def _is_valid_move(self, pos: Tuple[int, int]) -> bool:
-        return (0 <= pos[0] < self.maze.width and 
-                0 <= pos[1] < self.maze.height and 
-                not self.maze.is_wall(*pos))
+        return self.maze.in_bounds(*pos) and not self.maze.is_wall(*pos)
     
     def get_position(self) -> Tuple[int, int]:
         return self.current_pos
     
     def get_path(self) -> List[Tuple[int, int]]:
+        if self.algorithm == "field" and self.path_index >= len(self.path):
+            return self.field.path_from(self.current_pos)
         return self.path[self.path_index:]
     
     def switch_algorithm(self, algorithm: str):
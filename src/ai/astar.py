@@ -1,39 +1,155 @@
 import heapq
+import time
 from typing import List, Tuple, Dict, Optional, Set
 
 from maze.maze import Maze
+from ai.paths import reconstruct_path
+
+class AStarSearch:
+    """A* that can be paused and resumed, with a best-effort partial path.
+    
+    `step()` expands cells until an expansion count or a deadline runs
+    out, so a long search can be spread over several frames. Until it
+    finishes, `partial_path()` leads to the expanded cell nearest the
+    goal (lowest f breaking ties). Expanded cells never change parent,
+    so every partial path and the final path lie on one search tree,
+    and `route()` can lead from any cell walked so far to a later one.
+    """
+    
+    def __init__(self, maze: Maze, start: Tuple[int, int], goal: Tuple[int, int]):
+        self.maze = maze
+        self.start = start
+        self.goal = goal
+        self.version = maze.version  # Maze version the search was run against
+        
+        self.path = []   # Path to the goal once found
+        self.found = False
+        self.done = False
+        self.expanded = 0
+        
+        self.open_set = [(self.heuristic(start), start, 0)]
+        self.closed_set = set()
+        self.g_scores = {start: 0}
+        self.parents = {start: None}
+        self.best = start  # Expanded cell the partial path leads to
+        self._best_key = (self.heuristic(start), self.heuristic(start))
+        if start == goal:
+            self.path = [start]
+            self.found = self.done = True
+    
+    def heuristic(self, pos: Tuple[int, int]) -> float:
+        return abs(pos[0] - self.goal[0]) + abs(pos[1] - self.goal[1])
+    
+    def step(self, max_expansions: Optional[int] = None, deadline: Optional[float] = None) -> bool:
+        """Expand until either budget runs out; True once the search has finished.
+        
+        `deadline` is a time.perf_counter() value, checked every 64 expansions.
+        """
+        open_set, closed_set = self.open_set, self.closed_set
+        g_scores, parents, goal = self.g_scores, self.parents, self.goal
+        budget = 0
+        
+        while not self.done:
+            if max_expansions is not None and budget >= max_expansions:
+                break
+            if deadline is not None and budget % 64 == 63 and time.perf_counter() >= deadline:
+                break
+            if not open_set:
+                self.done = True
+                break
+            
+            f_score, current_pos, g_score = heapq.heappop(open_set)
+            if current_pos == goal:
+                self.path = reconstruct_path(parents, goal)
+                self.found = self.done = True
+                break
+            if current_pos in closed_set:
+                continue
+            
+            closed_set.add(current_pos)
+            self.expanded += 1
+            budget += 1
+            key = (f_score - g_score, f_score)
+            if key < self._best_key:
+                self.best, self._best_key = current_pos, key
+            
+            for neighbor in self.maze.iter_neighbors(*current_pos):
+                if neighbor in closed_set:
+                    continue
+                tentative_g_score = g_score + 1
+                if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
+                    g_scores[neighbor] = tentative_g_score
+                    parents[neighbor] = current_pos
+                    heapq.heappush(open_set, (tentative_g_score + self.heuristic(neighbor),
+                                              neighbor, tentative_g_score))
+        return self.done
+    
+    def run(self) -> List[Tuple[int, int]]:
+        """Finish the search and return the path to the goal, or []"""
+        self.step()
+        return self.path
+    
+    def partial_path(self) -> List[Tuple[int, int]]:
+        """The full path once found, otherwise the path to the best cell so far"""
+        if self.found:
+            return self.path
+        return reconstruct_path(self.parents, self.best)
+    
+    def route(self, pos: Tuple[int, int], path: List[Tuple[int, int]]) -> Optional[List[Tuple[int, int]]]:
+        """Cells from pos to the end of `path` through the search tree.
+        
+        `path` must start at the search's start, like partial_path().
+        Returns None when pos is not an expanded cell of this search.
+        """
+        if pos not in self.closed_set and pos != self.start:
+            return None
+        # path[i] is the tree cell at depth i, so only the first g(pos) cells can be ancestors
+        ancestors = set(path[:self.g_scores[pos] + 1])
+        climb = [pos]
+        while climb[-1] not in ancestors:
+            climb.append(self.parents[climb[-1]])
+        return climb + path[self.g_scores[climb[-1]] + 1:]
 
 class AStar:
     def __init__(self, maze: Maze):
         self.maze = maze
+        self.nodes_expanded = 0  # Expansions made by the last find_path
     
     def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
         return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
     
+    def search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> AStarSearch:
+        """Start a resumable search; nothing is expanded until it is stepped"""
+        return AStarSearch(self.maze, start, goal)
+    
     def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
         if start == goal:
             return [start]
         
-        # Priority queue: (f_score, position, g_score, path)
-        open_set = [(0, start, 0, [start])]
+        # Priority queue: (f_score, position, g_score)
+        open_set = [(0, start, 0)]
         closed_set = set()
         
         # g_score: cost from start to current position
         g_scores = {start: 0}
+        # Best known predecessor of each position
+        parents = {start: None}
         
         while open_set:
-            f_score, current_pos, g_score, path = heapq.heappop(open_set)
+            f_score, current_pos, g_score = heapq.heappop(open_set)
             
             if current_pos == goal:
-                return path
+                return reconstruct_path(parents, goal)
             
             if current_pos in closed_set:
                 continue
             
             closed_set.add(current_pos)
+            self.nodes_expanded += 1
             
             # Check neighbors
-            neighbors = self.maze.get_neighbors(*current_pos)
+            neighbors = self.maze.iter_neighbors(*current_pos)
             
             for neighbor in neighbors:
                 if neighbor in closed_set:
@@ -48,8 +164,8 @@ class AStar:
                     g_scores[neighbor] = tentative_g_score
                     f_score = tentative_g_score + self.heuristic(neighbor, goal)
                     
-                    new_path = path + [neighbor]
-                    heapq.heappush(open_set, (f_score, neighbor, tentative_g_score, new_path))
+                    parents[neighbor] = current_pos
+                    heapq.heappush(open_set, (f_score, neighbor, tentative_g_score))
         
         # No path found
         return []
@@ -60,22 +176,23 @@ class AStar:
         if start == goal:
             return [start]
         
-        open_set = [(0, start, 0, [start])]
+        open_set = [(0, start, 0)]
         closed_set = set()
         g_scores = {start: 0}
+        parents = {start: None}
         
         while open_set:
-            f_score, current_pos, g_score, path = heapq.heappop(open_set)
+            f_score, current_pos, g_score = heapq.heappop(open_set)
             
             if current_pos == goal:
-                return path
+                return reconstruct_path(parents, goal)
             
             if current_pos in closed_set:
                 continue
             
             closed_set.add(current_pos)
             
-            neighbors = self.maze.get_neighbors(*current_pos)
+            neighbors = self.maze.iter_neighbors(*current_pos)
             
             for neighbor in neighbors:
                 if neighbor in closed_set or neighbor in obstacles:
@@ -89,7 +206,7 @@ class AStar:
                     g_scores[neighbor] = tentative_g_score
                     f_score = tentative_g_score + self.heuristic(neighbor, goal)
                     
-                    new_path = path + [neighbor]
-                    heapq.heappush(open_set, (f_score, neighbor, tentative_g_score, new_path))
+                    parents[neighbor] = current_pos
+                    heapq.heappush(open_set, (f_score, neighbor, tentative_g_score))
         
         return [] 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Optional
+
+class AsyncPlanner:
+    """Runs path planning on a background thread or process pool.
+    
+    `submit` returns a concurrent.futures.Future; callers poll it on a
+    later tick instead of blocking the game loop. With "thread" the
+    solver shares the live maze. With "process" the solver (and its
+    maze) is pickled, so the worker plans on a snapshot and the GIL is
+    not shared with the game.
+    
+    The counters are meant for sizing the pool: `queue_depth` is the
+    number of jobs submitted but not yet finished, and the latency
+    figures measure submission to completion.
+    """
+    
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None):
+        if kind == "thread":
+            self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="planner")
+        elif kind == "process":
+            self.executor = ProcessPoolExecutor(max_workers)
+        else:
+            raise ValueError(f"unknown planner kind {kind!r}, expected 'thread' or 'process'")
+        self.kind = kind
+        
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0   # Cancelled before running
+        self.discarded = 0   # Already running or finished when cancelled; results ignored
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self._pending = set()
+        self._lock = threading.Lock()   # Done callbacks run on executor threads
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+    
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.completed if self.completed else 0.0
+    
+    def submit(self, func: Callable, *args) -> Future:
+        """Schedule func(*args); with processes both must be picklable"""
+        submitted_at = time.perf_counter()
+        future = self.executor.submit(func, *args)
+        with self._lock:
+            self.submitted += 1
+            self._pending.add(future)
+        
+        def finished(future: Future):
+            latency = time.perf_counter() - submitted_at
+            with self._lock:
+                self._pending.discard(future)
+                if future.cancelled():
+                    return
+                self.completed += 1
+                self.last_latency = latency
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+        
+        future.add_done_callback(finished)
+        return future
+    
+    def cancel(self, future: Future):
+        """Drop a stale job: stop it if it has not started, otherwise ignore its result"""
+        cancelled = future.cancel()
+        with self._lock:
+            if cancelled:
+                self.cancelled += 1
+            else:
+                self.discarded += 1
+    
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
\ No newline at end of file
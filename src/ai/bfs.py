@@ -2,51 +2,52 @@ from typing import List, Tuple, Dict, Optional
 from collections import deque
 
 from maze.maze import Maze
+from ai.paths import reconstruct_path, PathTable
 
 class BFS:
     def __init__(self, maze: Maze):
         self.maze = maze
+        self.nodes_expanded = 0
     
     def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
         if start == goal:
             return [start]
         
-        # Initialize BFS
-        queue = deque([(start, [start])])  # (position, path)
-        visited = {start}
+        # Initialize BFS; each cell remembers the cell it was reached from
+        queue = deque([start])
+        parents = {start: None}
         
         while queue:
-            current_pos, path = queue.popleft()
+            current_pos = queue.popleft()
+            self.nodes_expanded += 1
             
             # Get neighbors
-            neighbors = self.maze.get_neighbors(*current_pos)
+            neighbors = self.maze.iter_neighbors(*current_pos)
             
             for neighbor in neighbors:
-                if neighbor == goal:
-                    return path + [neighbor]
-                
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+                if neighbor not in parents:
+                    parents[neighbor] = current_pos
+                    if neighbor == goal:
+                        return reconstruct_path(parents, goal)
+                    queue.append(neighbor)
         
         # No path found
         return []
     
-    def find_all_paths(self, start: Tuple[int, int]) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
-        queue = deque([(start, [start])])
-        visited = {start}
-        paths = {start: [start]}
+    def find_all_paths(self, start: Tuple[int, int]) -> PathTable:
+        queue = deque([start])
+        parents = {start: None}
         
         while queue:
-            current_pos, path = queue.popleft()
+            current_pos = queue.popleft()
             
-            neighbors = self.maze.get_neighbors(*current_pos)
+            neighbors = self.maze.iter_neighbors(*current_pos)
             
             for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = path + [neighbor]
-                    paths[neighbor] = new_path
-                    queue.append((neighbor, new_path))
+                if neighbor not in parents:
+                    parents[neighbor] = current_pos
+                    queue.append(neighbor)
         
-        return paths 
\ No newline at end of file
+        # Paths are rebuilt from the shared parent table on access
+        return PathTable(parents)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import heapq
+from typing import List, Tuple, Dict, Optional
+
+from maze.maze import Maze
+from ai.paths import reconstruct_path
+
+def join_paths(forward: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+               backward: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+               meet_forward: Tuple[int, int],
+               meet_backward: Tuple[int, int]) -> List[Tuple[int, int]]:
+    # start .. meet_forward, then meet_backward .. goal
+    path = reconstruct_path(forward, meet_forward)
+    tail = reconstruct_path(backward, meet_backward)
+    tail.reverse()
+    if tail and tail[0] == path[-1]:
+        tail = tail[1:]
+    return path + tail
+
+class BidirectionalBFS:
+    """Breadth-first search from both ends, one whole level at a time.
+    
+    The smaller frontier is always the one grown. Cells the other side
+    has already expanded have all their neighbors recorded, so a meeting
+    can only happen on the other side's current frontier; every meeting
+    found in a level therefore has the same length and the first one is
+    a shortest path.
+    """
+    
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.nodes_expanded = 0
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+        
+        # Index 0 grows from start, index 1 from goal
+        parents = ({start: None}, {goal: None})
+        frontiers = [[start], [goal]]
+        
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own_parents, other_parents = parents[side], parents[1 - side]
+            next_frontier = []
+            
+            for current_pos in frontiers[side]:
+                self.nodes_expanded += 1
+                for neighbor in self.maze.iter_neighbors(*current_pos):
+                    if neighbor in other_parents:
+                        if side == 0:
+                            return join_paths(own_parents, other_parents, current_pos, neighbor)
+                        return join_paths(other_parents, own_parents, neighbor, current_pos)
+                    if neighbor not in own_parents:
+                        own_parents[neighbor] = current_pos
+                        next_frontier.append(neighbor)
+            
+            frontiers[side] = next_frontier
+        
+        # No path found
+        return []
+
+class BidirectionalAStar:
+    """Bidirectional A* with the average of the two heuristics as potential.
+    
+    The forward search uses p(n) = (h(n, goal) - h(n, start)) / 2 and the
+    backward search -p(n). Both then see the same non-negative reduced
+    edge costs, so closed cells are final from either side and the search
+    can stop as soon as the two smallest keys add up to the best path
+    found. Keys are doubled to keep them integral.
+    """
+    
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.nodes_expanded = 0
+    
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+    
+    def potential(self, pos: Tuple[int, int], start: Tuple[int, int], goal: Tuple[int, int]) -> float:
+        return self.heuristic(pos, goal) - self.heuristic(pos, start)
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+        
+        # Index 0 searches from start toward goal, index 1 the reverse;
+        # the backward search uses the negated potential
+        signs = (1, -1)
+        open_sets = ([(self.potential(start, start, goal), start, 0)],
+                     [(-self.potential(goal, start, goal), goal, 0)])
+        g_scores = ({start: 0}, {goal: 0})
+        parents = ({start: None}, {goal: None})
+        closed_sets = (set(), set())
+        
+        # Best complete path found so far: (length, meeting cell)
+        best = None
+        
+        while open_sets[0] and open_sets[1]:
+            if best is not None and open_sets[0][0][0] + open_sets[1][0][0] >= 2 * best[0]:
+                break
+            
+            side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+            open_set, closed_set = open_sets[side], closed_sets[side]
+            own_g, other_g = g_scores[side], g_scores[1 - side]
+            sign = signs[side]
+            
+            _, current_pos, g_score = heapq.heappop(open_set)
+            if current_pos in closed_set:
+                continue
+            closed_set.add(current_pos)
+            self.nodes_expanded += 1
+            
+            for neighbor in self.maze.iter_neighbors(*current_pos):
+                if neighbor in closed_set:
+                    continue
+                
+                tentative_g_score = g_score + 1
+                if neighbor not in own_g or tentative_g_score < own_g[neighbor]:
+                    own_g[neighbor] = tentative_g_score
+                    parents[side][neighbor] = current_pos
+                    key = 2 * tentative_g_score + sign * self.potential(neighbor, start, goal)
+                    heapq.heappush(open_set, (key, neighbor, tentative_g_score))
+                
+                if neighbor in other_g:
+                    length = own_g[neighbor] + other_g[neighbor]
+                    if best is None or length < best[0]:
+                        best = (length, neighbor)
+        
+        if best is None:
+            return []
+        meet = best[1]
+        return join_paths(parents[0], parents[1], meet, meet)
\ No newline at end of file
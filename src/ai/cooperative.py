@@ -0,0 +1,246 @@
+import heapq
+from typing import List, Tuple, Dict, Optional, Sequence
+
+from maze.maze import Maze
+from ai.distance_field import DistanceField, get_distance_field
+
+class ReservationTable:
+    """Space-time cells claimed by agents: (x, y, t) -> agent.
+    
+    Claims are bucketed by time step, and `advance` drops every bucket
+    that is now in the past, so the table only ever holds about one
+    planning window per agent.
+    """
+    
+    def __init__(self):
+        self.now = 0
+        self._cells = {}      # (x, y, t) -> agent
+        self._by_time = {}    # t -> [(x, y, t)] claimed for that step
+        self._by_agent = {}   # agent -> [(x, y, t)] it claimed
+    
+    def __len__(self) -> int:
+        return len(self._cells)
+    
+    def reserve(self, cell: Tuple[int, int], t: int, agent: int):
+        key = (cell[0], cell[1], t)
+        self._cells[key] = agent
+        self._by_time.setdefault(t, []).append(key)
+        self._by_agent.setdefault(agent, []).append(key)
+    
+    def owner(self, cell: Tuple[int, int], t: int) -> Optional[int]:
+        return self._cells.get((cell[0], cell[1], t))
+    
+    def can_move(self, source: Tuple[int, int], target: Tuple[int, int], t: int, agent: int) -> bool:
+        """Whether agent may go from source at t to target at t + 1 (or wait, if equal)"""
+        cells = self._cells
+        other = cells.get((target[0], target[1], t + 1), agent)
+        if other != agent:
+            return False  # Someone will be standing there
+        # Swapping places with the agent coming the other way
+        other = cells.get((target[0], target[1], t), agent)
+        return other == agent or cells.get((source[0], source[1], t + 1)) != other
+    
+    def cancel(self, cell: Tuple[int, int], t: int, agent: int):
+        """Drop one claim if the agent holds it"""
+        key = (cell[0], cell[1], t)
+        if self._cells.get(key) == agent:
+            del self._cells[key]
+    
+    def release(self, agent: int):
+        """Drop every claim the agent still holds, e.g. before it replans"""
+        cells = self._cells
+        for key in self._by_agent.pop(agent, ()):
+            if cells.get(key) == agent:
+                del cells[key]
+    
+    def advance(self, now: int):
+        """Forget claims for time steps before now"""
+        cells = self._cells
+        for t in range(self.now, now):
+            for key in self._by_time.pop(t, ()):
+                cells.pop(key, None)
+        self.now = max(self.now, now)
+
+class CooperativePlanner:
+    """Conflict-free paths for many agents with windowed cooperative A* (WHCA*).
+    
+    Agents plan one at a time in space-time: each search may wait or
+    step, and must avoid the cells (and head-on swaps) that agents
+    planned before it have reserved. Searches only look `window` steps
+    ahead, using the true distance from a shared DistanceField per goal
+    as the heuristic, and every agent replans after `replan_interval`
+    steps. An agent that got boxed in plans first in the next round, so
+    the one it yielded to makes way instead.
+    
+    Arriving agents leave the board, as a finished racer would. Moves
+    are checked once more when executed, so an agent whose search
+    failed waits instead of colliding; `blocked_moves` counts these.
+    """
+    
+    def __init__(self, maze: Maze, starts: Sequence[Tuple[int, int]],
+                 goals: Optional[Sequence[Tuple[int, int]]] = None,
+                 window: int = 16, replan_interval: Optional[int] = None):
+        self.maze = maze
+        self.window = window
+        self.replan_interval = replan_interval or max(1, window // 2)
+        self.table = ReservationTable()
+        self.time = 0
+        
+        self.positions = [tuple(start) for start in starts]
+        if goals is None:
+            goals = [maze.get_goal_position()] * len(starts)
+        self.goals = [tuple(goal) for goal in goals]
+        self.active = [position != goal for position, goal in zip(self.positions, self.goals)]
+        self.plans = [[] for _ in self.positions]   # Cells for times time + 1, time + 2, ...
+        self.fields = {}   # goal -> DistanceField shared by its agents
+        self.priority = list(range(len(self.positions)))   # Planning order, first plans first
+        
+        self.nodes_expanded = 0   # Space-time states expanded by the last replan
+        self.blocked_moves = 0
+        self._replan_at = 0
+    
+    def _field(self, goal: Tuple[int, int]) -> DistanceField:
+        field = self.fields.get(goal)
+        if field is None or not field.is_current(self.maze):
+            field = get_distance_field(self.maze, goal)
+            self.fields[goal] = field
+        return field
+    
+    def replan(self):
+        """Plan a new window for every agent still on the board"""
+        table, now = self.table, self.time
+        agents = [agent for agent in self.priority if self.active[agent]]
+        for agent in agents:
+            table.release(agent)
+            # Held for the next step too, so every agent can at least wait where it is
+            table.reserve(self.positions[agent], now, agent)
+            table.reserve(self.positions[agent], now + 1, agent)
+        
+        self.nodes_expanded = 0
+        boxed_in = []
+        for agent in agents:
+            plan = self._plan(agent)
+            position = self.positions[agent]
+            if plan and plan[0] != position:
+                table.cancel(position, now + 1, agent)  # Free for agents planned after it
+            for t, cell in enumerate(plan, now + 1):
+                table.reserve(cell, t, agent)
+            if len(plan) < self.window and (not plan or plan[-1] != self.goals[agent]):
+                # Boxed in: it stays where the plan ends, so later agents plan around it
+                boxed_in.append(agent)
+                last = plan[-1] if plan else position
+                for t in range(now + len(plan) + 1, now + self.window + 1):
+                    if table.owner(last, t) is None:
+                        table.reserve(last, t, agent)
+            self.plans[agent] = plan
+        if boxed_in:
+            promoted = set(boxed_in)
+            self.priority = boxed_in + [agent for agent in self.priority if agent not in promoted]
+        self._replan_at = now + self.replan_interval
+    
+    def _plan(self, agent: int) -> List[Tuple[int, int]]:
+        start, goal = self.positions[agent], self.goals[agent]
+        field = self._field(goal)
+        if field.distance(*start) < 0:
+            return []  # Goal unreachable: stay put
+        
+        table, maze = self.table, self.maze
+        now = self.time
+        horizon = now + self.window
+        # Later steps first among equal f, to reach the horizon without detours
+        open_set = [(field.distance(*start), -now, start, 0)]
+        parents = {(start, now): None}
+        g_scores = {(start, now): 0}
+        closed_set = set()
+        # Boxed in before the horizon: follow the plan that stays clear longest
+        deepest = (start, now)
+        
+        while open_set:
+            _, negative_t, cell, g_score = heapq.heappop(open_set)
+            t = -negative_t
+            if cell == goal or t == horizon:
+                deepest = (cell, t)
+                break
+            if (cell, t) in closed_set:
+                continue
+            if t > deepest[1]:
+                deepest = (cell, t)
+            closed_set.add((cell, t))
+            self.nodes_expanded += 1
+            
+            for neighbor in [cell] + maze.iter_neighbors(*cell):
+                state = (neighbor, t + 1)
+                if state in closed_set or not table.can_move(cell, neighbor, t, agent):
+                    continue
+                tentative_g_score = g_score + 1
+                if state not in g_scores or tentative_g_score < g_scores[state]:
+                    g_scores[state] = tentative_g_score
+                    parents[state] = (cell, t)
+                    heapq.heappush(open_set, (tentative_g_score + field.distance(*neighbor),
+                                              -(t + 1), neighbor, tentative_g_score))
+        
+        plan = []
+        end = deepest
+        while end[1] > now:
+            plan.append(end[0])
+            end = parents[end]
+        plan.reverse()
+        return plan
+    
+    def step(self):
+        """Advance every agent one time step along its plan"""
+        if self.time >= self._replan_at:
+            self.replan()
+        
+        moves = {}
+        for agent, active in enumerate(self.active):
+            if active:
+                plan = self.plans[agent]
+                moves[agent] = plan.pop(0) if plan else self.positions[agent]
+        blocked = self._resolve_conflicts(moves)
+        if blocked:
+            self.blocked_moves += len(blocked)
+            self._replan_at = self.time + 1  # Those plans are off schedule now
+        
+        self.time += 1
+        for agent, target in moves.items():
+            self.positions[agent] = target
+            if target == self.goals[agent]:
+                self.active[agent] = False
+                self.plans[agent] = []
+                self.table.release(agent)
+        self.table.advance(self.time)
+    
+    def _resolve_conflicts(self, moves: Dict[int, Tuple[int, int]]) -> List[int]:
+        """Keep agents in place until no two share a cell or swap; returns those stopped"""
+        positions = self.positions
+        occupant = {positions[agent]: agent for agent in moves}
+        stopped = []
+        while True:
+            # Agents staying put claim their cells first, then movers in agent order
+            claims = {}
+            for agent, target in moves.items():
+                if target == positions[agent]:
+                    claims[target] = agent
+            conflicts = []
+            for agent, target in moves.items():
+                if target == positions[agent]:
+                    continue
+                other = occupant.get(target)
+                if target in claims or (other is not None and moves[other] == positions[agent]):
+                    conflicts.append(agent)
+                else:
+                    claims[target] = agent
+            if not conflicts:
+                return stopped
+            for agent in conflicts:
+                moves[agent] = positions[agent]
+            stopped.extend(conflicts)
+    
+    def run(self, max_steps: int) -> int:
+        """Step until every agent has arrived or max_steps pass; returns the steps taken"""
+        for steps in range(max_steps):
+            if not any(self.active):
+                return steps
+            self.step()
+        return max_steps
\ No newline at end of file
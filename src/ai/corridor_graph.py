@@ -0,0 +1,273 @@
+import heapq
+from array import array
+from typing import List, Tuple, Dict, Optional
+
+from maze.maze import Maze, DIRECTIONS
+
+# Number of open directions in each 4-bit neighbor mask
+MASK_DEGREE = bytes(bin(mask).count("1") for mask in range(16))
+
+class CorridorGraph:
+    """Maze preprocessed into filled dead ends plus a weighted junction graph.
+    
+    Dead-end filling repeatedly peels cells with a single open neighbor.
+    Each peeled cell remembers the neighbor it hung from, so the filled
+    parts become trees rooted on the remaining core. (A component that
+    peels away entirely, like a perfect maze, becomes one tree.) In the
+    core, cells with three or more open neighbors are junctions and the
+    chains of two-neighbor cells between them are corridors, each
+    contracted into one weighted edge.
+    
+    A query climbs from start and goal to the core through the trees.
+    On a tree this is the whole answer, so a perfect maze needs no
+    search at all. Otherwise A* runs over the junctions only, and its
+    result is expanded back into cells along the stored corridors.
+    """
+    
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.nodes_expanded = 0  # Junctions expanded by the last find_path
+        self.build()
+    
+    def build(self):
+        maze = self.maze
+        self.version = maze.version
+        self.width = width = maze.width
+        size = width * maze.height
+        masks = maze.neighbor_masks()
+        passable = maze.passable_mask().ravel().tobytes()
+        self.passable = passable
+        steps = [dy * width + dx for dx, dy in DIRECTIONS]
+        self.steps = steps
+        
+        # Open neighbors left, counted for passable cells only
+        degree = bytearray(MASK_DEGREE[masks[cell]] if passable[cell] else 0 for cell in range(size))
+        alive = bytearray(passable)
+        self.parent = parent = array('i', [-1]) * size   # Cell a peeled cell hung from
+        order = []                                         # Peeled cells, first peeled first
+        
+        # Dead-end filling
+        stack = [cell for cell in range(size) if passable[cell] and degree[cell] <= 1]
+        while stack:
+            cell = stack.pop()
+            if not alive[cell]:
+                continue
+            alive[cell] = 0
+            order.append(cell)
+            if degree[cell] == 0:
+                continue  # Last cell of a component: a root
+            mask = masks[cell]
+            for bit in range(4):
+                if mask >> bit & 1:
+                    neighbor = cell + steps[bit]
+                    if alive[neighbor]:
+                        parent[cell] = neighbor
+                        degree[neighbor] -= 1
+                        if degree[neighbor] <= 1:
+                            stack.append(neighbor)
+                        break
+        self.filled = len(order)
+        
+        # Depth below and root of every peeled cell, parents before children
+        self.depth = depth = array('i', bytes(4 * size))
+        self.root = root = array('i', range(size))
+        for cell in reversed(order):
+            up = parent[cell]
+            if up >= 0:
+                depth[cell] = depth[up] + 1
+                root[cell] = root[up]
+        
+        # Contract the core into junctions and corridors
+        self.alive = alive
+        self.corridors = []                          # Cell ids from one end to the other
+        self.corridor_of = array('i', [-1]) * size   # Corridor of each inner corridor cell
+        self.corridor_index = array('i', bytes(4 * size))
+        self.adjacent = {}                           # Junction -> [(junction, length, corridor)]
+        core = [cell for cell in range(size) if alive[cell]]
+        self.core_cells = len(core)
+        
+        junctions = [cell for cell in core if degree[cell] >= 3]
+        for junction in junctions:
+            self.adjacent[junction] = []
+        for junction in junctions:
+            self._trace_corridors(junction, masks, degree)
+        # Loops without any junction: promote one cell of each
+        for cell in core:
+            if cell not in self.adjacent and self.corridor_of[cell] < 0:
+                self.adjacent[cell] = []
+                self._trace_corridors(cell, masks, degree)
+    
+    def _trace_corridors(self, junction: int, masks: bytearray, degree: bytearray):
+        alive, steps = self.alive, self.steps
+        mask = masks[junction]
+        for bit in range(4):
+            if not mask >> bit & 1:
+                continue
+            cell = junction + steps[bit]
+            if not alive[cell]:
+                continue
+            if cell in self.adjacent:
+                # Two adjacent junctions: record the edge once
+                if junction < cell:
+                    self._add_corridor([junction, cell])
+                continue
+            if self.corridor_of[cell] >= 0:
+                continue  # Traced from its other end already
+            
+            cells = [junction, cell]
+            previous = junction
+            while cell not in self.adjacent:
+                cell_mask = masks[cell]
+                # Core cells between junctions have exactly two open neighbors
+                for next_bit in range(4):
+                    if cell_mask >> next_bit & 1:
+                        neighbor = cell + steps[next_bit]
+                        if alive[neighbor] and neighbor != previous:
+                            break
+                previous, cell = cell, neighbor
+                cells.append(cell)
+            self._add_corridor(cells)
+    
+    def _add_corridor(self, cells: List[int]):
+        corridor = len(self.corridors)
+        self.corridors.append(cells)
+        for index in range(1, len(cells) - 1):
+            self.corridor_of[cells[index]] = corridor
+            self.corridor_index[cells[index]] = index
+        length = len(cells) - 1
+        self.adjacent[cells[0]].append((cells[-1], length, corridor))
+        if cells[-1] != cells[0]:
+            self.adjacent[cells[-1]].append((cells[0], length, corridor))
+    
+    def _lift(self, cell: int) -> List[int]:
+        """Cells from `cell` up through its tree to the core (or tree root)"""
+        cells = [cell]
+        parent = self.parent
+        while parent[cell] >= 0:
+            cell = parent[cell]
+            cells.append(cell)
+        return cells
+    
+    def _tree_path(self, source: int, target: int) -> List[int]:
+        """Unique path between two cells of the same tree"""
+        parent, depth = self.parent, self.depth
+        left, right = [source], [target]
+        while depth[source] > depth[target]:
+            source = parent[source]
+            left.append(source)
+        while depth[target] > depth[source]:
+            target = parent[target]
+            right.append(target)
+        while source != target:
+            source, target = parent[source], parent[target]
+            left.append(source)
+            right.append(target)
+        right.pop()
+        right.reverse()
+        return left + right
+    
+    def _ends(self, cell: int) -> List[Tuple[int, int, List[int]]]:
+        """(junction, distance, cells from `cell` to it) for a core cell"""
+        if cell in self.adjacent:
+            return [(cell, 0, [cell])]
+        cells = self.corridors[self.corridor_of[cell]]
+        index = self.corridor_index[cell]
+        return [(cells[0], index, cells[index::-1]),
+                (cells[-1], len(cells) - 1 - index, cells[index:])]
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+        if not (self.maze.in_bounds(*start) and self.maze.in_bounds(*goal)):
+            return []
+        if self.maze.version != self.version:
+            self.build()
+        
+        width = self.width
+        source = start[1] * width + start[0]
+        target = goal[1] * width + goal[0]
+        if not (self.passable[source] and self.passable[target]):
+            return []
+        
+        if self.root[source] == self.root[target]:
+            cells = self._tree_path(source, target)
+        else:
+            up = self._lift(source)
+            down = self._lift(target)
+            if not (self.alive[up[-1]] and self.alive[down[-1]]):
+                return []  # A tree with no core: different components
+            core_path = self._core_path(up[-1], down[-1])
+            if not core_path:
+                return []
+            down.reverse()
+            cells = up[:-1] + core_path + down[1:]
+        
+        return [(cell % width, cell // width) for cell in cells]
+    
+    def _core_path(self, source: int, target: int) -> List[int]:
+        """Shortest path between two core cells, searching junctions only"""
+        width = self.width
+        target_x, target_y = target % width, target // width
+        
+        def heuristic(cell: int) -> int:
+            return abs(cell % width - target_x) + abs(cell // width - target_y)
+        
+        # The goal is a virtual node reached from the ends of target's corridor
+        goal_node = -1
+        exits = {}
+        for junction, distance, cells in self._ends(target):
+            # A corridor that loops back to one junction offers two ways out
+            if junction not in exits or distance < exits[junction][0]:
+                exits[junction] = (distance, cells)
+        open_set = []
+        g_scores = {}
+        parents = {}   # Node -> (previous node, cells leading from it)
+        
+        def push(node: int, g_score: int, previous: Optional[int], cells: List[int]):
+            if node not in g_scores or g_score < g_scores[node]:
+                g_scores[node] = g_score
+                parents[node] = (previous, cells)
+                f_score = g_score + (0 if node == goal_node else heuristic(node))
+                heapq.heappush(open_set, (f_score, g_score, node))
+        
+        for junction, distance, cells in self._ends(source):
+            push(junction, distance, None, cells)
+        # Both on one corridor: walking straight along it is a candidate too
+        if self.corridor_of[source] >= 0 and self.corridor_of[source] == self.corridor_of[target]:
+            cells = self.corridors[self.corridor_of[source]]
+            i, j = self.corridor_index[source], self.corridor_index[target]
+            push(goal_node, abs(i - j), None, cells[i:j + 1] if i <= j else cells[j:i + 1][::-1])
+        
+        closed_set = set()
+        while open_set:
+            _, g_score, node = heapq.heappop(open_set)
+            if node == goal_node:
+                break
+            if node in closed_set:
+                continue
+            closed_set.add(node)
+            self.nodes_expanded += 1
+            
+            if node in exits:
+                distance, cells = exits[node]
+                push(goal_node, g_score + distance, node, cells[::-1])
+            for neighbor, length, corridor in self.adjacent[node]:
+                if neighbor in closed_set:
+                    continue
+                cells = self.corridors[corridor]
+                push(neighbor, g_score + length, node, cells if cells[0] == node else cells[::-1])
+        else:
+            return []
+        
+        # Stitch the corridor pieces back together
+        pieces = []
+        node = goal_node
+        while node is not None:
+            previous, cells = parents[node]
+            pieces.append(cells)
+            node = previous
+        path = []
+        for cells in reversed(pieces):
+            path.extend(cells[1:] if path else cells)
+        return path
\ No newline at end of file
@@ -1,106 +1,126 @@
-from typing import List, Tuple, Dict, Optional, Set
+from typing import List, Tuple, Dict, Optional, Set, Iterator
 
 from maze.maze import Maze
 
-class DFS:
-    def __init__(self, maze: Maze):
+class DFSSearch:
+    """Depth-first search that can be paused and resumed.
+    
+    The recursion is replaced by a stack of neighbor iterators, and
+    `path` holds the cell of every stack frame, so the current branch is
+    one shared list that grows and shrinks in place. Cells are visited
+    in the same order as the recursive version.
+    
+    Iterating yields each cell as it is expanded; `step(n)` runs up to n
+    expansions and returns whether the search is finished.
+    """
+    
+    def __init__(self, maze: Maze, start: Tuple[int, int],
+                 goal: Optional[Tuple[int, int]] = None,
+                 blocked: Optional[Set[Tuple[int, int]]] = None,
+                 max_depth: Optional[int] = None):
         self.maze = maze
+        self.start = start
+        self.goal = goal
+        self.blocked = blocked or set()
+        self.max_depth = max_depth
+        
+        self.path = []     # Branch from start to the current cell
+        self.visited = set()
+        self.found = False
+        self.done = False
+        self.expanded = 0
+        self._stack = []   # One neighbor iterator per cell in path
+        self._started = False
     
-    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
-        if start == goal:
-            return [start]
+    def _push(self, pos: Tuple[int, int]):
+        self.visited.add(pos)
+        self.path.append(pos)
+        self.expanded += 1
+        # Cells at the depth limit are visited but not expanded further
+        if self.max_depth is None or len(self._stack) < self.max_depth:
+            self._stack.append(iter(self.maze.iter_neighbors(*pos)))
+        else:
+            self._stack.append(iter(()))
+    
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return self
+    
+    def __next__(self) -> Tuple[int, int]:
+        if self.done:
+            raise StopIteration
         
-        visited = set()
-        path = []
+        if not self._started:
+            self._started = True
+            if self.start == self.goal:
+                self.path.append(self.start)
+                self.found = self.done = True
+                return self.start
+            if self.start in self.blocked or (self.max_depth is not None and self.max_depth < 0):
+                self.done = True
+                raise StopIteration
+            self._push(self.start)
+            return self.start
         
-        def dfs_recursive(current_pos: Tuple[int, int], current_path: List[Tuple[int, int]]) -> bool:
-            if current_pos == goal:
-                path.extend(current_path)
-                return True
-            
-            if current_pos in visited:
-                return False
+        visited, blocked, stack = self.visited, self.blocked, self._stack
+        while stack:
+            for neighbor in stack[-1]:
+                if neighbor in visited or neighbor in blocked:
+                    continue
+                if neighbor == self.goal:
+                    self.path.append(neighbor)
+                    self.found = self.done = True
+                    return neighbor
+                self._push(neighbor)
+                return neighbor
             
-            visited.add(current_pos)
-            
-            neighbors = self.maze.get_neighbors(*current_pos)
-            
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    if dfs_recursive(neighbor, current_path + [neighbor]):
-                        return True
-            
-            return False
+            # Every neighbor tried, backtrack
+            stack.pop()
+            self.path.pop()
         
-        dfs_recursive(start, [start])
-        return path
+        self.done = True
+        raise StopIteration
+    
+    def step(self, count: int) -> bool:
+        """Run up to `count` expansions; True once the search has finished"""
+        for _ in range(count):
+            if next(self, None) is None:
+                break
+        return self.done
+    
+    def run(self) -> List[Tuple[int, int]]:
+        """Finish the search and return the path to the goal, or []"""
+        for _ in self:
+            pass
+        return self.path if self.found else []
+
+class DFS:
+    def __init__(self, maze: Maze):
+        self.maze = maze
+    
+    def search(self, start: Tuple[int, int], goal: Optional[Tuple[int, int]] = None,
+               blocked: Optional[Set[Tuple[int, int]]] = None,
+               max_depth: Optional[int] = None) -> DFSSearch:
+        """Start a resumable search; nothing is expanded until it is stepped"""
+        return DFSSearch(self.maze, start, goal, blocked, max_depth)
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        return self.search(start, goal).run()
     
     def explore_area(self, start: Tuple[int, int], max_depth: int = 100) -> Set[Tuple[int, int]]:
-        visited = set()
-        
-        def explore_recursive(pos: Tuple[int, int], depth: int):
-            if depth > max_depth or pos in visited:
-                return
-            
-            visited.add(pos)
-            
-            if depth < max_depth:
-                neighbors = self.maze.get_neighbors(*pos)
-                for neighbor in neighbors:
-                    explore_recursive(neighbor, depth + 1)
-        
-        explore_recursive(start, 0)
-        return visited
+        search = self.search(start, max_depth=max_depth)
+        search.run()
+        return search.visited
     
-    def find_alternative_path(self, start: Tuple[int, int], goal: Tuple[int, int], 
+    def find_alternative_path(self, start: Tuple[int, int], goal: Tuple[int, int],
                             blocked_positions: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
-        if start == goal:
-            return [start]
-        
-        visited = set()
-        path = []
-        
-        def dfs_avoid_blocks(current_pos: Tuple[int, int], current_path: List[Tuple[int, int]]) -> bool:
-            if current_pos == goal:
-                path.extend(current_path)
-                return True
-            
-            if current_pos in visited or current_pos in blocked_positions:
-                return False
-            
-            visited.add(current_pos)
-            
-            neighbors = self.maze.get_neighbors(*current_pos)
-            
-            for neighbor in neighbors:
-                if neighbor not in visited and neighbor not in blocked_positions:
-                    if dfs_avoid_blocks(neighbor, current_path + [neighbor]):
-                        return True
-            
-            return False
-        
-        dfs_avoid_blocks(start, [start])
-        return path
+        return self.search(start, goal, blocked=blocked_positions).run()
     
     def find_dead_ends(self, start: Tuple[int, int]) -> List[Tuple[int, int]]:
-        visited = set()
         dead_ends = []
         
-        def find_dead_ends_recursive(pos: Tuple[int, int]):
-            if pos in visited:
-                return
-            
-            visited.add(pos)
-            neighbors = self.maze.get_neighbors(*pos)
-            
+        for pos in self.search(start):
             # Check if this is a dead end (only one neighbor or no neighbors)
-            if len(neighbors) <= 1:
+            if len(self.maze.iter_neighbors(*pos)) <= 1:
                 dead_ends.append(pos)
-            
-            # Continue exploring
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    find_dead_ends_recursive(neighbor)
         
-        find_dead_ends_recursive(start)
-        return dead_ends 
\ No newline at end of file
+        return dead_ends
\ No newline at end of file
@@ -0,0 +1,132 @@
+import weakref
+from typing import List, Tuple, Optional
+
+import numpy as np
+
+from maze.maze import Maze, DIRECTIONS
+
+NO_DIRECTION = 255  # Goal, wall or unreachable cell
+# Direction index leading back from a neighbor to the cell it was reached from
+OPPOSITE = (2, 3, 0, 1)
+# Direction indices whose bit is set in each 4-bit neighbor mask
+MASK_DIRECTIONS = [tuple(i for i in range(4) if mask >> i & 1) for mask in range(16)]
+
+# Frontiers up to this size are expanded in plain Python; perfect mazes
+# have long, thin wavefronts where per-call NumPy overhead would dominate
+SMALL_FRONTIER = 64
+
+# Goals remembered per maze before the oldest field is dropped
+MAX_FIELDS_PER_MAZE = 8
+
+class DistanceField:
+    """Breadth-first distances from every cell to one goal.
+    
+    Alongside the distances, `directions` stores for each cell the index
+    into DIRECTIONS of its first step toward the goal (NO_DIRECTION when
+    there is none), so walking to the goal from anywhere costs O(1) per
+    step. Both tables are filled by one wavefront grown from the goal
+    over the maze's neighbor index.
+    """
+    
+    def __init__(self, maze: Maze, goal: Tuple[int, int]):
+        if not maze.in_bounds(*goal):
+            raise ValueError(f"goal {goal} is outside the maze")
+        self.goal = goal
+        self.version = maze.version
+        self.top = maze.row_range()[0]
+        self.width = maze.width
+        self.height = maze.row_range()[1] - self.top
+        
+        distances, directions = self._wavefront(maze.neighbor_masks())
+        self.distances = distances.reshape(self.height, self.width)
+        # Kept as bytes for fast scalar reads; the array is a view of it
+        self._directions = directions.tobytes()
+        self.directions = np.frombuffer(self._directions, dtype=np.uint8).reshape(self.height, self.width)
+    
+    def _wavefront(self, masks: bytearray) -> Tuple[np.ndarray, np.ndarray]:
+        size = self.width * self.height
+        steps = [dy * self.width + dx for dx, dy in DIRECTIONS]
+        mask_array = np.frombuffer(masks, dtype=np.uint8)
+        distances = np.full(size, -1, dtype=np.int32)
+        directions = np.full(size, NO_DIRECTION, dtype=np.uint8)
+        # Memoryviews make scalar writes cheap in the Python branch
+        distance_view, direction_view = memoryview(distances), memoryview(directions)
+        
+        goal_id = (self.goal[1] - self.top) * self.width + self.goal[0]
+        distances[goal_id] = 0
+        frontier = [goal_id]
+        level = 0
+        
+        while len(frontier):
+            level += 1
+            if len(frontier) <= SMALL_FRONTIER:
+                next_frontier = []
+                for cell in (frontier.tolist() if isinstance(frontier, np.ndarray) else frontier):
+                    for direction in MASK_DIRECTIONS[masks[cell]]:
+                        neighbor = cell + steps[direction]
+                        if distance_view[neighbor] < 0:
+                            distance_view[neighbor] = level
+                            direction_view[neighbor] = OPPOSITE[direction]
+                            next_frontier.append(neighbor)
+            else:
+                frontier = np.asarray(frontier)
+                frontier_masks = mask_array[frontier]
+                parts = []
+                for direction, step in enumerate(steps):
+                    neighbors = frontier[(frontier_masks >> direction & 1).astype(bool)] + step
+                    # Cells claimed by an earlier direction are already set
+                    neighbors = neighbors[distances[neighbors] < 0]
+                    distances[neighbors] = level
+                    directions[neighbors] = OPPOSITE[direction]
+                    parts.append(neighbors)
+                next_frontier = np.concatenate(parts)
+            frontier = next_frontier
+        
+        return distances, directions
+    
+    def is_current(self, maze: Maze) -> bool:
+        """False once the maze has changed since the field was built"""
+        return maze.version == self.version and maze.row_range()[0] == self.top
+    
+    def distance(self, x: int, y: int) -> int:
+        """Steps from (x, y) to the goal, or -1 if the goal is unreachable"""
+        if 0 <= x < self.width and 0 <= y - self.top < self.height:
+            return int(self.distances[y - self.top, x])
+        return -1
+    
+    def next_step(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """The cell one step closer to the goal, or None at the goal or if unreachable"""
+        if 0 <= x < self.width and 0 <= y - self.top < self.height:
+            direction = self._directions[(y - self.top) * self.width + x]
+            if direction != NO_DIRECTION:
+                dx, dy = DIRECTIONS[direction]
+                return (x + dx, y + dy)
+        return None
+    
+    def path_from(self, start: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Shortest path from start to the goal in find_path form, or []"""
+        if start == self.goal:
+            return [start]
+        path = [start]
+        step = self.next_step(*start)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(*step)
+        return path if path[-1] == self.goal else []
+
+# maze -> {goal: DistanceField}; entries go away with their maze
+_fields = weakref.WeakKeyDictionary()
+
+def get_distance_field(maze: Maze, goal: Tuple[int, int]) -> DistanceField:
+    """Shared field for (maze, goal), rebuilt only after the maze changes"""
+    fields = _fields.setdefault(maze, {})
+    if fields and not next(iter(fields.values())).is_current(maze):
+        fields.clear()  # The maze changed, so every field of it is stale
+    
+    field = fields.pop(goal, None)
+    if field is None:
+        if len(fields) >= MAX_FIELDS_PER_MAZE:
+            del fields[next(iter(fields))]  # Least recently used goal
+        field = DistanceField(maze, goal)
+    fields[goal] = field
+    return field
\ No newline at end of file
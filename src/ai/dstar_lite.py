@@ -0,0 +1,139 @@
+import heapq
+from typing import List, Tuple, Dict, Optional
+
+from maze.maze import Maze
+
+INFINITY = float("inf")
+
+class DStarLite:
+    """Incremental shortest paths for mazes whose cells change at runtime.
+    
+    D* Lite (Koenig & Likhachev) searches backward from the goal and keeps
+    its g/rhs values and open list between calls. On the next find_path
+    only the cells reported by maze.changes_since() and their neighbors
+    are re-evaluated, and the repair stops as soon as the agent's cell is
+    consistent again, so the work follows the size of the change rather
+    than the size of the maze. A new goal, or changes the maze cannot
+    list, start a fresh search.
+    """
+    
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.nodes_expanded = 0  # Expansions made by the last find_path
+        self.goal = None
+        self.version = maze.version  # Maze version the search state matches
+        maze.track_changes()
+    
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+    
+    def _reset(self, start: Tuple[int, int], goal: Tuple[int, int]):
+        self.goal = goal
+        self.start = start
+        self.key_modifier = 0   # k_m: heuristic drift as the start moves
+        self.version = self.maze.version
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.open = {goal: self._key(goal)}  # Cell -> key it is queued with
+        self.queue = [self.open[goal] + (goal,)]
+    
+    def _key(self, pos: Tuple[int, int]) -> Tuple[float, float]:
+        best = min(self.g.get(pos, INFINITY), self.rhs.get(pos, INFINITY))
+        start = self.start
+        return (best + abs(pos[0] - start[0]) + abs(pos[1] - start[1]) + self.key_modifier, best)
+    
+    def _update_vertex(self, pos: Tuple[int, int]):
+        if pos != self.goal:
+            # One step to the best neighbor; walls cannot be entered or left
+            rhs = INFINITY
+            if self.maze.is_path(*pos):
+                g = self.g
+                for neighbor in self.maze.iter_neighbors(*pos):
+                    if neighbor in g and g[neighbor] < rhs:
+                        rhs = g[neighbor]
+                rhs += 1
+            self.rhs[pos] = rhs
+        
+        if self.g.get(pos, INFINITY) != self.rhs.get(pos, INFINITY):
+            key = self._key(pos)
+            self.open[pos] = key
+            heapq.heappush(self.queue, key + (pos,))
+        else:
+            self.open.pop(pos, None)  # Its heap entry is skipped when popped
+    
+    def _top(self) -> Optional[Tuple[float, float, Tuple[int, int]]]:
+        # Drop entries for cells that were removed or re-queued since
+        queue, open_keys = self.queue, self.open
+        while queue:
+            k1, k2, pos = queue[0]
+            if open_keys.get(pos) == (k1, k2):
+                return queue[0]
+            heapq.heappop(queue)
+        return None
+    
+    def _compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        while True:
+            top = self._top()
+            start_key = self._key(self.start)
+            if top is None or (top[:2] >= start_key and
+                               rhs.get(self.start, INFINITY) == g.get(self.start, INFINITY)):
+                return
+            
+            k1, k2, pos = heapq.heappop(self.queue)
+            new_key = self._key(pos)
+            if (k1, k2) < new_key:
+                # Stale after the start moved; requeue with the current key
+                self.open[pos] = new_key
+                heapq.heappush(self.queue, new_key + (pos,))
+                continue
+            
+            del self.open[pos]
+            self.nodes_expanded += 1
+            if g.get(pos, INFINITY) > rhs.get(pos, INFINITY):
+                g[pos] = rhs[pos]
+                for neighbor in self.maze.iter_neighbors(*pos):
+                    self._update_vertex(neighbor)
+            else:
+                g[pos] = INFINITY
+                self._update_vertex(pos)
+                for neighbor in self.maze.iter_neighbors(*pos):
+                    self._update_vertex(neighbor)
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+        
+        changes = self.maze.changes_since(self.version) if goal == self.goal else None
+        if changes is None:
+            self._reset(start, goal)
+        else:
+            # Moving the start lowers every heuristic by at most the distance moved
+            self.key_modifier += self.heuristic(self.start, start)
+            self.start = start
+            self.version = self.maze.version
+            for cell in set(changes):
+                self._update_vertex(cell)
+                for neighbor in self.maze.get_all_neighbors(*cell):
+                    self._update_vertex(neighbor)
+        
+        self._compute_shortest_path()
+        return self._extract_path()
+    
+    def _extract_path(self) -> List[Tuple[int, int]]:
+        g = self.g
+        distance = g.get(self.start, INFINITY)
+        if distance == INFINITY:
+            return []
+        
+        # Follow decreasing g; each step must get exactly one closer
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            current = min(self.maze.iter_neighbors(*current),
+                          key=lambda pos: g.get(pos, INFINITY), default=None)
+            if current is None or g.get(current, INFINITY) != distance - len(path):
+                return []
+            path.append(current)
+        return path
\ No newline at end of file
@@ -0,0 +1,127 @@
+import heapq
+from array import array
+from typing import List, Tuple
+
+from maze.maze import Maze, DIRECTIONS
+
+# Heap keys pack f, MAX_SCORE - g and the cell id into 32-bit fields
+MAX_SCORE = (1 << 32) - 1
+ID_MASK = (1 << 32) - 1
+# Stamps are 32-bit; the arrays are cleared by reallocating before they wrap
+MAX_GENERATION = (1 << 31) - 1
+
+class FlatAStar:
+    """A* over flat cell ids (y * width + x) using the maze's neighbor index.
+    
+    Ids count rows from the first row the maze holds (row_range()[0]),
+    as the neighbor index does, so a scrolled MazeWindow works too.
+    
+    Scores, parents and the closed set live in arrays allocated once per
+    maze size. Each search bumps a generation number and an entry only
+    counts if its stamp matches, so nothing is cleared or reallocated
+    between calls. Ties on f are broken toward larger g (deeper nodes),
+    then by cell id, which keeps the search deterministic and expands
+    fewer nodes on mazes with many equal-cost paths.
+    """
+    
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.size = 0
+        self.width = 0
+        self.generation = 0
+        self.nodes_expanded = 0
+        self._allocate()
+    
+    def _allocate(self):
+        self.width = self.maze.width
+        self.size = self.maze.width * self.maze.height
+        # Typed arrays store raw 32-bit ints, so writes allocate nothing
+        self.g_scores = array('i', bytes(4 * self.size))
+        self.parents = array('i', bytes(4 * self.size))
+        self.seen = array('i', bytes(4 * self.size))    # Generation that last wrote g/parent
+        self.closed = array('i', bytes(4 * self.size))  # Generation that closed the cell
+        self.generation = 0
+        
+        # Flat id offsets of the open directions for each 4-bit mask
+        steps = [dy * self.width + dx for dx, dy in DIRECTIONS]
+        self.offsets = [tuple(steps[i] for i in range(4) if mask >> i & 1)
+                        for mask in range(16)]
+    
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+        
+        maze = self.maze
+        if (maze.width != self.width or maze.width * maze.height != self.size
+                or self.generation == MAX_GENERATION):
+            self._allocate()
+        if not (maze.in_bounds(*start) and maze.in_bounds(*goal)):
+            return []
+        
+        self.generation += 1
+        generation = self.generation
+        g_scores, parents, seen, closed = self.g_scores, self.parents, self.seen, self.closed
+        masks = maze.neighbor_masks()
+        offsets = self.offsets
+        width = self.width
+        top = maze.row_range()[0]
+        # Band-local rows; the heuristic only needs differences
+        goal_x, goal_y = goal[0], goal[1] - top
+        source = (start[1] - top) * width + start[0]
+        target = goal_y * width + goal_x
+        
+        seen[source] = generation
+        g_scores[source] = 0
+        parents[source] = -1
+        
+        # Heap entries are single ints packing (f, -g, id) so that equal f
+        # pops the larger g first; no tuples are allocated per push
+        open_set = [self.heuristic(start, goal) << 64 | MAX_SCORE << 32 | source]
+        expanded = 0
+        
+        while open_set:
+            entry = heapq.heappop(open_set)
+            current = entry & ID_MASK
+            
+            if closed[current] == generation:
+                continue
+            if current == target:
+                self.nodes_expanded = expanded
+                return self._reconstruct(target, top)
+            
+            closed[current] = generation
+            expanded += 1
+            tentative_g_score = g_scores[current] + 1
+            
+            for offset in offsets[masks[current]]:
+                neighbor = current + offset
+                if closed[neighbor] == generation:
+                    continue
+                if seen[neighbor] != generation or tentative_g_score < g_scores[neighbor]:
+                    seen[neighbor] = generation
+                    g_scores[neighbor] = tentative_g_score
+                    parents[neighbor] = current
+                    y, x = divmod(neighbor, width)
+                    f_score = tentative_g_score + abs(x - goal_x) + abs(y - goal_y)
+                    heapq.heappush(open_set, f_score << 64 |
+                                   (MAX_SCORE - tentative_g_score) << 32 | neighbor)
+        
+        # No path found
+        self.nodes_expanded = expanded
+        return []
+    
+    def _reconstruct(self, target: int, top: int) -> List[Tuple[int, int]]:
+        width = self.width
+        parents = self.parents
+        path = []
+        node = target
+        while node != -1:
+            y, x = divmod(node, width)
+            path.append((x, y + top))
+            node = parents[node]
+        path.reverse()
+        return path
\ No newline at end of file
@@ -0,0 +1,305 @@
+import heapq
+from collections import deque
+from typing import List, Tuple, Dict, Optional
+
+import numpy as np
+
+from maze.maze import Maze
+from ai.paths import reconstruct_path
+
+# Border runs at least this long get a transition at each end instead of
+# a single one in the middle
+LONG_ENTRANCE = 6
+
+class HierarchicalPathfinder:
+    """HPA*: near-optimal paths over an abstract graph of cluster entrances.
+    
+    The maze is cut into cluster_size x cluster_size clusters. Every run
+    of open cell pairs across a cluster border is an entrance, and the
+    cells of its transitions become abstract nodes. Nodes on opposite
+    sides of a transition are linked with cost 1. Nodes of the same
+    cluster are linked with their distance inside that cluster. A query
+    connects start and goal to the nodes of their clusters, runs A* on
+    the small abstract graph, and then refines each abstract step with a
+    search confined to one cluster.
+    
+    The graph is built once. After cell edits, only the clusters (and
+    borders) holding the changed cells are rebuilt.
+    """
+    
+    def __init__(self, maze: Maze, cluster_size: int = 16):
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.nodes_expanded = 0  # Abstract nodes expanded by the last find_path
+        maze.track_changes()
+        self.build()
+    
+    def build(self):
+        """(Re)build the whole abstract graph"""
+        size = self.cluster_size
+        self.version = self.maze.version
+        self.columns = (self.maze.width + size - 1) // size
+        self.rows = (self.maze.height + size - 1) // size
+        # Border (cx, cy, 0) lies right of cluster (cx, cy), (cx, cy, 1) below it
+        self.transitions = {}  # border -> [(cell in first cluster, cell in second)]
+        self.links = {}        # node -> set of nodes across a border
+        self.edges = {}        # cluster -> {node: [(node, distance inside cluster)]}
+        
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                if cx + 1 < self.columns:
+                    self._build_border((cx, cy, 0))
+                if cy + 1 < self.rows:
+                    self._build_border((cx, cy, 1))
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                self._build_cluster((cx, cy))
+    
+    def update(self):
+        """Bring the graph up to date with the maze, rebuilding only what changed"""
+        changes = self.maze.changes_since(self.version)
+        if changes is None:
+            self.build()
+            return
+        self.version = self.maze.version
+        
+        size = self.cluster_size
+        borders, clusters = set(), set()
+        for x, y in changes:
+            cx, cy = x // size, y // size
+            clusters.add((cx, cy))
+            # Cells along a cluster edge can change that border's entrances
+            if x % size == size - 1 and cx + 1 < self.columns:
+                borders.add((cx, cy, 0))
+            if x % size == 0 and cx > 0:
+                borders.add((cx - 1, cy, 0))
+            if y % size == size - 1 and cy + 1 < self.rows:
+                borders.add((cx, cy, 1))
+            if y % size == 0 and cy > 0:
+                borders.add((cx, cy - 1, 1))
+        
+        for border in borders:
+            self._build_border(border)
+            cx, cy, below = border
+            clusters.add((cx, cy))
+            clusters.add((cx, cy + 1) if below else (cx + 1, cy))
+        for cluster in clusters:
+            self._build_cluster(cluster)
+    
+    def cluster_of(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        return (pos[0] // self.cluster_size, pos[1] // self.cluster_size)
+    
+    def _build_border(self, border: Tuple[int, int, int]):
+        # Unlink the transitions this border had before
+        for a, b in self.transitions.get(border, ()):
+            self.links[a].discard(b)
+            self.links[b].discard(a)
+        
+        size = self.cluster_size
+        cx, cy, below = border
+        if below:
+            y = (cy + 1) * size - 1
+            pairs = [((x, y), (x, y + 1))
+                     for x in range(cx * size, min(self.maze.width, (cx + 1) * size))]
+        else:
+            x = (cx + 1) * size - 1
+            pairs = [((x, y), (x + 1, y))
+                     for y in range(cy * size, min(self.maze.height, (cy + 1) * size))]
+        
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and self.maze.is_path(*a) and self.maze.is_path(*b):
+                run.append((a, b))
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        
+        self.transitions[border] = transitions
+        for a, b in transitions:
+            self.links.setdefault(a, set()).add(b)
+            self.links.setdefault(b, set()).add(a)
+    
+    def _cluster_nodes(self, cluster: Tuple[int, int]) -> List[Tuple[int, int]]:
+        cx, cy = cluster
+        nodes = set()
+        for a, _ in self.transitions.get((cx, cy, 0), ()):
+            nodes.add(a)
+        for a, _ in self.transitions.get((cx, cy, 1), ()):
+            nodes.add(a)
+        for _, b in self.transitions.get((cx - 1, cy, 0), ()):
+            nodes.add(b)
+        for _, b in self.transitions.get((cx, cy - 1, 1), ()):
+            nodes.add(b)
+        return sorted(nodes)
+    
+    def _build_cluster(self, cluster: Tuple[int, int]):
+        nodes = self._cluster_nodes(cluster)
+        edges = {node: [] for node in nodes}
+        grid = self._cluster_grid(cluster)
+        for i, node in enumerate(nodes):
+            distances = self._distances(grid, node)
+            # Distances are symmetric, so each pair is searched once
+            for other in nodes[i + 1:]:
+                distance = distances[self._local_id(grid, other)]
+                if distance >= 0:
+                    edges[node].append((other, distance))
+                    edges[other].append((node, distance))
+        self.edges[cluster] = edges
+    
+    def _cluster_grid(self, cluster: Tuple[int, int]):
+        """(x0, y0, width, masks) with open-direction masks local to the cluster.
+        
+        Cells outside the cluster count as walls, so a plain BFS over the
+        masks stays inside it.
+        """
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        passable = self.maze.get_region(x0, y0, size, size) != 1
+        height, width = passable.shape
+        padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = passable
+        masks = (padded[:-2, 1:-1]
+                 | padded[1:-1, 2:] << 1
+                 | padded[2:, 1:-1] << 2
+                 | padded[1:-1, :-2] << 3)
+        return x0, y0, width, masks.tobytes()
+    
+    def _local_id(self, grid, pos: Tuple[int, int]) -> int:
+        x0, y0, width, _ = grid
+        return (pos[1] - y0) * width + pos[0] - x0
+    
+    def _distances(self, grid, source: Tuple[int, int]) -> List[int]:
+        """BFS distances from source to every cell of the cluster (-1 if unreachable)"""
+        _, _, width, masks = grid
+        steps = (-width, 1, width, -1)
+        distances = [-1] * len(masks)
+        origin = self._local_id(grid, source)
+        distances[origin] = 0
+        frontier = [origin]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for cell in frontier:
+                mask = masks[cell]
+                for bit in range(4):
+                    if mask >> bit & 1:
+                        neighbor = cell + steps[bit]
+                        if distances[neighbor] < 0:
+                            distances[neighbor] = distance
+                            next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distances
+    
+    def _local_search(self, source: Tuple[int, int], cluster: Tuple[int, int],
+                      target: Optional[Tuple[int, int]] = None):
+        """BFS confined to one cluster; returns (distances, parents)"""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        x1, y1 = x0 + size, y0 + size
+        distances = {source: 0}
+        parents = {source: None}
+        queue = deque([source])
+        
+        while queue:
+            current_pos = queue.popleft()
+            if current_pos == target:
+                break
+            distance = distances[current_pos] + 1
+            for neighbor in self.maze.iter_neighbors(*current_pos):
+                if neighbor not in distances and x0 <= neighbor[0] < x1 and y0 <= neighbor[1] < y1:
+                    distances[neighbor] = distance
+                    parents[neighbor] = current_pos
+                    queue.append(neighbor)
+        
+        return distances, parents
+    
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+        if not (self.maze.in_bounds(*start) and self.maze.in_bounds(*goal)):
+            return []
+        if self.maze.version != self.version:
+            self.update()
+        
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        best = []
+        if start_cluster == goal_cluster:
+            # The abstract route below may still be shorter
+            distances, parents = self._local_search(start, start_cluster, goal)
+            if goal in distances:
+                best = reconstruct_path(parents, goal)
+        
+        # Temporary edges from start and goal to the entrances of their clusters
+        start_edges = [(node, distance) for node, distance in self._entrance_distances(start)
+                       if node != start]
+        goal_edges = dict(self._entrance_distances(goal))
+        
+        abstract = self._abstract_search(start, goal, start_edges, goal_edges)
+        if abstract:
+            path = self._refine(abstract)
+            if not best or len(path) < len(best):
+                best = path
+        return best
+    
+    def _entrance_distances(self, pos: Tuple[int, int]) -> List[Tuple[Tuple[int, int], int]]:
+        """(node, distance) for each node of pos's cluster reachable inside it"""
+        cluster = self.cluster_of(pos)
+        grid = self._cluster_grid(cluster)
+        distances = self._distances(grid, pos)
+        return [(node, distances[self._local_id(grid, node)]) for node in self._cluster_nodes(cluster)
+                if distances[self._local_id(grid, node)] >= 0]
+    
+    def _abstract_search(self, start, goal, start_edges, goal_edges) -> List[Tuple[int, int]]:
+        open_set = [(self.heuristic(start, goal), start, 0)]
+        g_scores = {start: 0}
+        parents = {start: None}
+        closed_set = set()
+        
+        while open_set:
+            f_score, current_pos, g_score = heapq.heappop(open_set)
+            if current_pos == goal:
+                return reconstruct_path(parents, goal)
+            if current_pos in closed_set:
+                continue
+            closed_set.add(current_pos)
+            self.nodes_expanded += 1
+            
+            neighbors = list(self.edges[self.cluster_of(current_pos)].get(current_pos, ()))
+            neighbors.extend((node, 1) for node in self.links.get(current_pos, ()))
+            if current_pos == start:
+                neighbors.extend(start_edges)
+            if current_pos in goal_edges:
+                neighbors.append((goal, goal_edges[current_pos]))
+            
+            for neighbor, cost in neighbors:
+                if neighbor in closed_set:
+                    continue
+                tentative_g_score = g_score + cost
+                if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
+                    g_scores[neighbor] = tentative_g_score
+                    parents[neighbor] = current_pos
+                    f_score = tentative_g_score + self.heuristic(neighbor, goal)
+                    heapq.heappush(open_set, (f_score, neighbor, tentative_g_score))
+        
+        # No path found
+        return []
+    
+    def _refine(self, abstract: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Expand abstract steps into cells, one cluster at a time"""
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                path.append(b)  # Crossing a transition
+                continue
+            parents = self._local_search(a, self.cluster_of(a), b)[1]
+            path.extend(reconstruct_path(parents, b)[1:])
+        return path
\ No newline at end of file
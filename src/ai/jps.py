@@ -0,0 +1,150 @@
+import heapq
+from typing import List, Tuple, Optional
+
+import numpy as np
+
+from maze.maze import Maze
+from ai.paths import reconstruct_path
+
+class JumpPointSearch:
+    """Jump Point Search for 4-connected grids.
+    
+    A* that only opens jump points: cells where the straight line it was
+    reached along meets a new opening (a forced neighbor), plus the goal.
+    Runs of symmetric straight moves are skipped in a single scan instead
+    of being pushed onto the heap cell by cell. The pruning rules are
+    the never-diagonal variant from PathFinding.js; a vertical scan also
+    stops wherever a horizontal scan from it would find a jump point.
+    """
+    
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.nodes_expanded = 0
+        self._cells = b""
+        self._stride = 0
+        self._top = 0
+        self._version = None  # Maze version _cells was copied at
+    
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+    
+    def _load(self):
+        # Passable cells with a one-cell wall border, flattened so the
+        # scans can look one step off the grid without bounds checks.
+        # Copied again only when the maze changes or its band scrolls.
+        first_row, last_row = self.maze.row_range()
+        if self._version == self.maze.version and self._top == first_row:
+            return
+        passable = self.maze.get_region(0, first_row, self.maze.width, last_row - first_row) != 1
+        self._cells = np.pad(passable, 1).tobytes()
+        self._stride = self.maze.width + 2
+        self._top = first_row
+        self._version = self.maze.version
+    
+    def _index(self, x: int, y: int) -> int:
+        return (y - self._top + 1) * self._stride + x + 1
+    
+    def _jump(self, x: int, y: int, dx: int, dy: int,
+              goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Scan from (x, y) along (dx, dy) and return the first jump point"""
+        cells, stride = self._cells, self._stride
+        i = self._index(x, y)
+        step = dy * stride + dx
+        
+        while True:
+            x += dx
+            y += dy
+            i += step
+            if not cells[i]:
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            
+            if dx:
+                # Moving horizontally: an opening above or below that the
+                # previous cell could not reach directly
+                if ((cells[i - stride] and not cells[i - stride - dx]) or
+                    (cells[i + stride] and not cells[i + stride - dx])):
+                    return (x, y)
+            else:
+                if ((cells[i - 1] and not cells[i - 1 - step]) or
+                    (cells[i + 1] and not cells[i + 1 - step])):
+                    return (x, y)
+                # Horizontal jump points make this cell a turning point
+                if self._jump(x, y, 1, 0, goal) or self._jump(x, y, -1, 0, goal):
+                    return (x, y)
+    
+    def _successor_directions(self, pos: Tuple[int, int],
+                              parent: Optional[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        cells, stride = self._cells, self._stride
+        x, y = pos
+        i = self._index(x, y)
+        
+        if parent is None:
+            candidates = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        else:
+            # Keep going straight or turn; never head back toward the parent
+            dx = (x > parent[0]) - (x < parent[0])
+            dy = (y > parent[1]) - (y < parent[1])
+            if dx:
+                candidates = [(0, -1), (0, 1), (dx, 0)]
+            else:
+                candidates = [(-1, 0), (1, 0), (0, dy)]
+        
+        return [(dx, dy) for dx, dy in candidates if cells[i + dy * stride + dx]]
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+        if not (self.maze.in_bounds(*start) and self.maze.in_bounds(*goal)):
+            return []
+        
+        self._load()
+        
+        # Priority queue: (f_score, position, g_score)
+        open_set = [(self.heuristic(start, goal), start, 0)]
+        closed_set = set()
+        g_scores = {start: 0}
+        parents = {start: None}
+        
+        while open_set:
+            f_score, current_pos, g_score = heapq.heappop(open_set)
+            
+            if current_pos == goal:
+                return self._expand(reconstruct_path(parents, goal))
+            
+            if current_pos in closed_set:
+                continue
+            
+            closed_set.add(current_pos)
+            self.nodes_expanded += 1
+            
+            for dx, dy in self._successor_directions(current_pos, parents[current_pos]):
+                jump_point = self._jump(current_pos[0], current_pos[1], dx, dy, goal)
+                if jump_point is None or jump_point in closed_set:
+                    continue
+                
+                # Jump points are reached in a straight line
+                tentative_g_score = g_score + self.heuristic(current_pos, jump_point)
+                if jump_point not in g_scores or tentative_g_score < g_scores[jump_point]:
+                    g_scores[jump_point] = tentative_g_score
+                    parents[jump_point] = current_pos
+                    f_score = tentative_g_score + self.heuristic(jump_point, goal)
+                    heapq.heappush(open_set, (f_score, jump_point, tentative_g_score))
+        
+        # No path found
+        return []
+    
+    def _expand(self, jump_points: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Fill in the straight runs between jump points, cell by cell"""
+        path = [jump_points[0]]
+        for x2, y2 in jump_points[1:]:
+            x, y = path[-1]
+            dx = (x2 > x) - (x2 < x)
+            dy = (y2 > y) - (y2 < y)
+            while (x, y) != (x2, y2):
+                x += dx
+                y += dy
+                path.append((x, y))
+        return path
\ No newline at end of file
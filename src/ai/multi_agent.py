@@ -0,0 +1,148 @@
+import random
+from typing import List, Tuple, Optional, Sequence
+
+import numpy as np
+
+from config.settings import AI_UPDATE_RATE
+from maze.maze import Maze, DIRECTIONS
+from ai.distance_field import DistanceField, NO_DIRECTION, MASK_DIRECTIONS, get_distance_field
+
+# Ticks without moving before an agent tries a random step
+STUCK_LIMIT = 10
+
+# Offsets per direction index, with a zero row for NO_DIRECTION
+_DX = np.zeros(256, dtype=np.int32)
+_DY = np.zeros(256, dtype=np.int32)
+for _direction, (_dx, _dy) in enumerate(DIRECTIONS):
+    _DX[_direction], _DY[_direction] = _dx, _dy
+
+class MultiAgentController:
+    """Many AI racers in one maze, advanced together once per tick.
+    
+    Positions, goals, stuck counters and the distance left to each goal
+    live in NumPy arrays indexed by agent. Agents chasing the same goal
+    share one DistanceField, so planning costs one wavefront per goal
+    however many agents there are, and a tick moves every agent of a
+    goal with a single lookup into the field's direction table.
+    """
+    
+    def __init__(self, maze: Maze, starts: Sequence[Tuple[int, int]],
+                 goals: Optional[Sequence[Tuple[int, int]]] = None):
+        self.maze = maze
+        self.update_counter = 0
+        self.goals = []    # Distinct goals; goal_ids index into it
+        self.fields = {}   # goal -> DistanceField shared by its agents
+        
+        count = len(starts)
+        self.xs = np.array([x for x, _ in starts], dtype=np.int32)
+        self.ys = np.array([y for _, y in starts], dtype=np.int32)
+        self.goal_ids = np.zeros(count, dtype=np.int32)
+        self.stuck = np.zeros(count, dtype=np.int32)
+        self.remaining = np.full(count, -1, dtype=np.int32)  # Steps left, -1 if unreachable or off the band
+        
+        if goals is None:
+            goals = [maze.get_goal_position()] * count
+        for agent, goal in enumerate(goals):
+            self.goal_ids[agent] = self._goal_id(goal)
+        self._refresh_remaining()
+    
+    def __len__(self) -> int:
+        return len(self.xs)
+    
+    def _goal_id(self, goal: Tuple[int, int]) -> int:
+        goal = tuple(goal)
+        if goal not in self.goals:
+            self.goals.append(goal)
+        return self.goals.index(goal)
+    
+    def _field(self, goal: Tuple[int, int]) -> DistanceField:
+        # Held here so goals beyond the shared per-maze limit are not rebuilt every tick
+        field = self.fields.get(goal)
+        if field is None or not field.is_current(self.maze):
+            field = get_distance_field(self.maze, goal)
+            self.fields[goal] = field
+        return field
+    
+    def _groups(self):
+        """(goal, agent indices, flat cell ids, field) for each goal in use.
+        
+        Agents outside the maze's current rows (a scrolled MazeWindow) are
+        left out: they have no cell in the fields, so they wait.
+        """
+        first_row, last_row = self.maze.row_range()
+        inside = ((self.ys >= first_row) & (self.ys < last_row)
+                  & (self.xs >= 0) & (self.xs < self.maze.width))
+        for goal_id, goal in enumerate(self.goals):
+            agents = np.flatnonzero((self.goal_ids == goal_id) & inside)
+            if len(agents):
+                field = self._field(goal)
+                cells = (self.ys[agents] - field.top) * field.width + self.xs[agents]
+                yield goal, agents, cells, field
+    
+    def _refresh_remaining(self):
+        self.remaining[:] = -1
+        for _, agents, cells, field in self._groups():
+            self.remaining[agents] = field.distances.ravel()[cells]
+    
+    def update(self):
+        self.update_counter += 1
+        
+        # Only update AI every N frames, like AIController
+        if self.update_counter % AI_UPDATE_RATE != 0:
+            return
+        self.step()
+    
+    def step(self):
+        """Move every agent one cell toward its goal"""
+        for _, agents, cells, field in self._groups():
+            directions = field.directions.ravel()[cells]
+            self.xs[agents] += _DX[directions]
+            self.ys[agents] += _DY[directions]
+            
+            # Agents at their goal wait there; the rest are stuck when they had no step
+            waiting = (directions == NO_DIRECTION) & (field.distances.ravel()[cells] != 0)
+            self.stuck[agents] = np.where(waiting, self.stuck[agents] + 1, 0)
+        
+        stuck_agents = np.flatnonzero(self.stuck > STUCK_LIMIT)
+        if len(stuck_agents):
+            self._random_steps(stuck_agents)
+        self._refresh_remaining()
+    
+    def _random_steps(self, agents: np.ndarray):
+        # Rare (walled-in agents only), so plain Python is fine here
+        masks = self.maze.neighbor_masks()
+        top = self.maze.row_range()[0]
+        width = self.maze.width
+        for agent in agents.tolist():
+            x, y = int(self.xs[agent]), int(self.ys[agent])
+            choices = MASK_DIRECTIONS[masks[(y - top) * width + x]]
+            if choices:
+                dx, dy = DIRECTIONS[random.choice(choices)]
+                self.xs[agent], self.ys[agent] = x + dx, y + dy
+                self.stuck[agent] = 0
+    
+    def get_position(self, agent: int) -> Tuple[int, int]:
+        return (int(self.xs[agent]), int(self.ys[agent]))
+    
+    def get_positions(self) -> List[Tuple[int, int]]:
+        return list(zip(self.xs.tolist(), self.ys.tolist()))
+    
+    def get_path(self, agent: int) -> List[Tuple[int, int]]:
+        """Cells the agent will walk from here to its goal"""
+        goal = self.goals[self.goal_ids[agent]]
+        return self._field(goal).path_from(self.get_position(agent))
+    
+    def arrived(self) -> np.ndarray:
+        """Boolean array, True for agents standing on their goal"""
+        return self.remaining == 0
+    
+    def set_goal(self, agent: int, goal: Tuple[int, int]):
+        self.goal_ids[agent] = self._goal_id(goal)
+        self.stuck[agent] = 0
+        self._refresh_remaining()
+    
+    def reset(self, starts: Sequence[Tuple[int, int]]):
+        self.xs[:] = [x for x, _ in starts]
+        self.ys[:] = [y for _, y in starts]
+        self.stuck[:] = 0
+        self._refresh_remaining()
\ No newline at end of file
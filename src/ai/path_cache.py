@@ -0,0 +1,123 @@
+import weakref
+from collections import OrderedDict
+from typing import List, Tuple, Dict, Optional
+
+from maze.maze import Maze
+
+class PathCache:
+    """LRU cache of solved paths keyed by (maze, version, algorithm, start, goal).
+    
+    Mazes are identified by id() plus their version counter, so editing
+    a maze makes its old entries unreachable; they are dropped as soon
+    as the new version is seen, and when the maze itself is collected.
+    
+    Every suffix of a shortest path is a shortest path to the same goal,
+    so for shortest-path solvers each cell of a cached path is indexed
+    and a query from any of them is answered without searching.
+    """
+    
+    def __init__(self, max_entries: int = 256, max_cells: int = 1_000_000):
+        self.max_entries = max_entries
+        self.max_cells = max_cells   # Total length of all cached paths
+        self.cells = 0
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+        
+        self._entries = OrderedDict()  # key -> path tuple
+        # (maze id, version, algorithm, goal) -> {cell: (key, index) of a path through it}
+        self._suffixes = {}
+        self._versions = {}            # maze id -> version the entries belong to
+        self._mazes = {}               # maze id -> weakref that purges on collection
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _maze_key(self, maze: Maze) -> Tuple[int, int]:
+        maze_id = id(maze)
+        if maze_id not in self._mazes:
+            self._mazes[maze_id] = weakref.ref(maze, lambda _, maze_id=maze_id: self._purge(maze_id))
+        if self._versions.get(maze_id, maze.version) != maze.version:
+            self._purge(maze_id, forget=False)
+        self._versions[maze_id] = maze.version
+        return maze_id, maze.version
+    
+    def get(self, maze: Maze, algorithm: str, start: Tuple[int, int],
+            goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        maze_id, version = self._maze_key(maze)
+        key = (maze_id, version, algorithm, start, goal)
+        
+        path = self._entries.get(key)
+        if path is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(path)
+        
+        # A longer cached shortest path through start answers it as well
+        through = self._suffixes.get((maze_id, version, algorithm, goal), {}).get(start)
+        if through is not None:
+            key, index = through
+            self._entries.move_to_end(key)
+            self.subpath_hits += 1
+            return list(self._entries[key][index:])
+        
+        self.misses += 1
+        return None
+    
+    def put(self, maze: Maze, algorithm: str, start: Tuple[int, int], goal: Tuple[int, int],
+            path: List[Tuple[int, int]], shortest: bool = True):
+        maze_id, version = self._maze_key(maze)
+        key = (maze_id, version, algorithm, start, goal)
+        if len(path) > self.max_cells:
+            return  # Would evict everything else and still not fit
+        if key in self._entries:
+            self._remove(key)
+        
+        path = tuple(path)
+        self._entries[key] = path
+        self.cells += len(path)
+        if shortest and path:
+            suffixes = self._suffixes.setdefault((maze_id, version, algorithm, goal), {})
+            for index, cell in enumerate(path):
+                suffixes[cell] = (key, index)
+        
+        while len(self._entries) > self.max_entries or self.cells > self.max_cells:
+            self._remove(next(iter(self._entries)))
+    
+    def find_path(self, maze: Maze, algorithm: str, solver, start: Tuple[int, int],
+                  goal: Tuple[int, int], shortest: bool = True) -> List[Tuple[int, int]]:
+        """Cached solver.find_path(start, goal)"""
+        path = self.get(maze, algorithm, start, goal)
+        if path is None:
+            path = solver.find_path(start, goal)
+            self.put(maze, algorithm, start, goal, path, shortest)
+        return path
+    
+    def clear(self):
+        self._entries.clear()
+        self._suffixes.clear()
+        self._versions.clear()
+        self._mazes.clear()
+        self.cells = 0
+    
+    def _remove(self, key: Tuple):
+        path = self._entries.pop(key)
+        self.cells -= len(path)
+        maze_id, version, algorithm, start, goal = key
+        suffix_key = (maze_id, version, algorithm, goal)
+        suffixes = self._suffixes.get(suffix_key)
+        if suffixes is not None:
+            # Other paths may have indexed the same cells since
+            for cell in path:
+                if suffixes.get(cell, (None,))[0] == key:
+                    del suffixes[cell]
+            if not suffixes:
+                del self._suffixes[suffix_key]
+    
+    def _purge(self, maze_id: int, forget: bool = True):
+        """Drop every entry of one maze, e.g. after it changed or was collected"""
+        for key in [key for key in self._entries if key[0] == maze_id]:
+            self._remove(key)
+        if forget:
+            self._versions.pop(maze_id, None)
+            self._mazes.pop(maze_id, None)
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import Dict, List, Tuple, Optional, Iterator
+from collections.abc import Mapping
+
+def reconstruct_path(parents: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+                     goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    # Walk parent pointers back to the root (whose parent is None)
+    path = []
+    node = goal
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
+
+class PathTable(Mapping):
+    """Read-only {cell: path} view over a shared parent table.
+    
+    Paths are rebuilt on access, so the table costs one entry per cell
+    instead of one full path per cell.
+    """
+    
+    def __init__(self, parents: Dict[Tuple[int, int], Optional[Tuple[int, int]]]):
+        self.parents = parents
+    
+    def __getitem__(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        if pos not in self.parents:
+            raise KeyError(pos)
+        return reconstruct_path(self.parents, pos)
+    
+    def __contains__(self, pos) -> bool:
+        return pos in self.parents
+    
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.parents)
+    
+    def __len__(self) -> int:
+        return len(self.parents)
\ No newline at end of file
@@ -0,0 +1,111 @@
+import json
+import math
+from typing import Callable, Dict, Tuple, Optional, NamedTuple
+
+import numpy as np
+
+from config.settings import SOLVER_CALIBRATION
+from maze.maze import Maze
+from ai.bfs import BFS
+from ai.astar import AStar
+from ai.dfs import DFS
+from ai.flat_astar import FlatAStar
+from ai.bidirectional import BidirectionalBFS, BidirectionalAStar
+from ai.jps import JumpPointSearch
+from ai.dstar_lite import DStarLite
+from ai.hpa import HierarchicalPathfinder
+from ai.corridor_graph import CorridorGraph
+
+# Replans a solver is expected to serve, used to spread its build time
+EXPECTED_QUERIES = 10
+
+class SolverSpec(NamedTuple):
+    factory: Callable[[Maze], object]   # maze -> object with find_path(start, goal)
+    shortest: bool                      # Paths are shortest, so cached suffixes can be reused
+    auto: bool                          # May be picked by the "auto" algorithm
+
+# name -> SolverSpec
+SOLVERS: Dict[str, SolverSpec] = {}
+
+def register_solver(name: str, factory: Callable[[Maze], object], shortest: bool = True,
+                    auto: Optional[bool] = None):
+    """Make a solver available to AIController by name.
+    
+    `auto` defaults to `shortest`: the "auto" algorithm only swaps
+    between solvers whose paths are interchangeable. It picks a solver
+    only once a benchmark run has calibrated it (benchmark.py calibrate).
+    """
+    SOLVERS[name] = SolverSpec(factory, shortest, shortest if auto is None else auto)
+
+def create_solver(name: str, maze: Maze):
+    if name not in SOLVERS:
+        raise ValueError(f"unknown solver {name!r}, expected one of {', '.join(SOLVERS)}")
+    return SOLVERS[name].factory(maze)
+
+def maze_features(maze: Maze) -> Tuple[int, float]:
+    """(cells, density) used to look up calibration data.
+    
+    Density is corridor links per open cell: 1.0 for a perfect maze,
+    rising toward 2.0 as walls are knocked out into open rooms.
+    """
+    masks = np.frombuffer(bytes(maze.neighbor_masks()), dtype=np.uint8)
+    passable = maze.passable_mask().ravel()
+    open_cells = int(passable.sum())
+    if not open_cells:
+        return maze.width * maze.height, 0.0
+    links = int(np.unpackbits(masks[passable]).sum()) // 2
+    return maze.width * maze.height, links / open_cells
+
+# path -> parsed calibration file (None if missing)
+_calibrations = {}
+
+def load_calibration(path: str = SOLVER_CALIBRATION) -> Optional[dict]:
+    if path not in _calibrations:
+        try:
+            with open(path) as file:
+                _calibrations[path] = json.load(file)
+        except FileNotFoundError:
+            _calibrations[path] = None
+    return _calibrations[path]
+
+def choose_solver(maze: Maze, calibration: Optional[dict] = None, default: str = "astar") -> str:
+    """Fastest calibrated solver for mazes most like this one.
+    
+    The nearest calibration point is found on log10(cells) and density.
+    Solvers are ranked by their query time plus build time spread over
+    EXPECTED_QUERIES queries. Returns `default` when nothing usable
+    has been calibrated.
+    """
+    if calibration is None:
+        calibration = load_calibration()
+    if not calibration:
+        return default
+    
+    cells, density = maze_features(maze)
+    
+    def distance(point: dict) -> float:
+        # A density step of 0.25 weighs about as much as a tenfold size change
+        return ((math.log10(point["cells"]) - math.log10(cells)) ** 2
+                + (4 * (point["density"] - density)) ** 2)
+    
+    def cost(timing: dict) -> float:
+        return timing["build"] / EXPECTED_QUERIES + timing["query"]
+    
+    for point in sorted(calibration["points"], key=distance):
+        timings = {name: timing for name, timing in point["solvers"].items()
+                   if name in SOLVERS and SOLVERS[name].auto}
+        if timings:
+            return min(timings, key=lambda name: cost(timings[name]))
+    return default
+
+register_solver("bfs", BFS)
+register_solver("astar", AStar)
+register_solver("dfs", DFS, shortest=False)
+register_solver("astar_flat", FlatAStar)
+register_solver("bfs_bidir", BidirectionalBFS)
+register_solver("astar_bidir", BidirectionalAStar)
+register_solver("jps", JumpPointSearch)
+register_solver("corridor", CorridorGraph)
+register_solver("hpa", HierarchicalPathfinder, shortest=False)
+# Keeps search state between calls for mazes that change while it runs
+register_solver("dstar", DStarLite, auto=False)
\ No newline at end of file
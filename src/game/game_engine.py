@@ -9,6 +9,7 @@ from config.settings import *
 from maze.maze_generator import MazeGenerator
 from player.player import Player
 from ai.ai_controller import AIController
+from ai.async_planner import AsyncPlanner
 from game.renderer import Renderer
 from game.input_handler import InputHandler
 from ui.hud import HUD
@@ -35,6 +36,7 @@ class GameEngine:
         self.maze = None
         self.player = None
         self.ai_controller = None
+        self.planner = AsyncPlanner(PLANNER_EXECUTOR, PLANNER_WORKERS) if PLANNER_EXECUTOR else None
         self.renderer = Renderer(self.screen)
         self.input_handler = InputHandler()
         self.hud = HUD()
@@ -49,14 +51,17 @@ class GameEngine:
     
     def init_game(self):
         # Generate new maze
-        self.maze = self.maze_generator.generate_maze()
+        self.maze = self.maze_generator.generate_maze(MAZE_GENERATION_ALGORITHM,
+                                                      placement=START_GOAL_PLACEMENT)
         
         # Initialize player at start position
         start_pos = self.maze.get_start_position()
         self.player = Player(start_pos[0], start_pos[1], PLAYER_SPEED)
         
         # Initialize AI controller
-        self.ai_controller = AIController(self.maze, AI_ALGORITHM)
+        self.ai_controller = AIController(self.maze, AI_ALGORITHM, planner=self.planner,
+                                          planning_budget=PLANNING_BUDGET,
+                                          planning_time_budget=PLANNING_TIME_BUDGET)
         
         # Reset game state
         self.start_time = pygame.time.get_ticks()
@@ -145,5 +150,7 @@ class GameEngine:
             self.render()
             self.clock.tick(self.fps)
         
+        if self.planner is not None:
+            self.planner.shutdown(wait=False)
         pygame.quit()
         sys.exit() 
\ No newline at end of file
@@ -16,9 +16,11 @@ class Renderer:
         self.maze_offset_y = (WINDOW_HEIGHT - MAZE_HEIGHT * CELL_SIZE) // 2
     
     def render_maze(self, maze: Maze):
-        for y in range(maze.height):
-            for x in range(maze.width):
-                cell = maze.get_cell(x, y)
+        # Read the whole grid in one go instead of per-cell lookups
+        first_row, last_row = maze.row_range()
+        rows = maze.get_region(0, first_row, maze.width, last_row - first_row).tolist()
+        for y, row in enumerate(rows):
+            for x, cell in enumerate(row):
                 screen_x = x * CELL_SIZE + self.maze_offset_x
                 screen_y = y * CELL_SIZE + self.maze_offset_y
                 
@@ -1,22 +1,84 @@
 from typing import List, Tuple, Optional
+from collections import deque
 import random
 
+import numpy as np
+
+# Up, Right, Down, Left - bit i of a neighbor mask is set when direction i is open
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+MASK_OFFSETS = [tuple(DIRECTIONS[i] for i in range(4) if mask >> i & 1) for mask in range(16)]
+
+# Passability changes remembered once change tracking is on
+CHANGE_LOG_LIMIT = 4096
+
 class Maze:
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
-        self.grid = [[1 for _ in range(width)] for _ in range(height)]  # 1 = wall
+        # Contiguous row-major storage, one byte per cell
+        self.grid = np.ones((height, width), dtype=np.uint8)  # 1 = wall
         self.start_pos = None
         self.goal_pos = None
+        
+        # Compiled neighbor index: one 4-bit open-direction mask per cell,
+        # built on first use and patched by set_cell
+        self._neighbor_masks = None
+        # Bumped whenever passability may have changed, so derived data
+        # (distance fields, cached paths) can tell it is stale
+        self.version = 0
+        # (version, x, y) of each change; off until track_changes is called
+        # so bulk generation pays nothing
+        self._change_log = None
     
     def get_cell(self, x: int, y: int) -> int:
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x]
+            return int(self.grid[y, x])
         return 1  # Return wall for out of bounds
     
     def set_cell(self, x: int, y: int, value: int):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.grid[y][x] = value
+            if (self.grid[y, x] == 1) != (value == 1):
+                self.version += 1
+                if self._change_log is not None:
+                    self._change_log.append((self.version, x, y))
+                if self._neighbor_masks is not None:
+                    self._patch_neighbor_index(x, y, value != 1)
+            self.grid[y, x] = value
+    
+    def fill(self, value: int):
+        self.grid.fill(value)
+        self.invalidate_neighbor_index()
+    
+    def set_cells(self, xs: np.ndarray, ys: np.ndarray, value: int):
+        """Set every (xs[i], ys[i]) to value; coordinates must be in bounds"""
+        self.grid[ys, xs] = value
+        self.invalidate_neighbor_index()
+    
+    def set_row(self, y: int, values: np.ndarray):
+        """Overwrite row y with values (one cell value per column)"""
+        self.grid[y] = values
+        self.invalidate_neighbor_index()
+    
+    def get_row(self, y: int) -> np.ndarray:
+        """Return a view of row y (writes go through to the maze)"""
+        return self.grid[y]
+    
+    def get_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Return a view of the given region, clipped to the maze bounds"""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = max(x0, min(self.width, x + width)), max(y0, min(self.height, y + height))
+        return self.grid[y0:y1, x0:x1]
+    
+    def passable_mask(self) -> np.ndarray:
+        """Boolean array, True where the cell is path, start or goal"""
+        return self.grid != 1
+    
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    def row_range(self) -> Tuple[int, int]:
+        """First and one-past-last row index currently held by the maze"""
+        return 0, self.height
     
     def set_start(self, x: int, y: int):
         self.start_pos = (x, y)
@@ -55,6 +117,75 @@ class Maze:
         
         return neighbors
     
+    def build_neighbor_index(self) -> bytearray:
+        """Compile the open-direction mask of every cell in one vectorized pass"""
+        padded = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = self.passable_mask()
+        masks = (padded[:-2, 1:-1]
+                 | padded[1:-1, 2:] << 1
+                 | padded[2:, 1:-1] << 2
+                 | padded[1:-1, :-2] << 3)
+        self._neighbor_masks = bytearray(masks.tobytes())
+        return self._neighbor_masks
+    
+    def invalidate_neighbor_index(self):
+        """Drop the neighbor index, e.g. after writing through a grid view"""
+        self._neighbor_masks = None
+        self.version += 1
+        if self._change_log is not None:
+            self._change_log.append((self.version, None, None))  # Unknown cells
+    
+    def track_changes(self, limit: int = CHANGE_LOG_LIMIT):
+        """Start recording passability changes for changes_since"""
+        if self._change_log is None:
+            self._change_log = deque(maxlen=limit)
+    
+    def changes_since(self, version: int) -> Optional[List[Tuple[int, int]]]:
+        """Cells whose passability changed after `version`, oldest first.
+        
+        Returns None when that cannot be told: tracking was off or the log
+        has been trimmed since, or a bulk write changed unknown cells.
+        """
+        count = self.version - version
+        if count == 0:
+            return []
+        log = self._change_log
+        if log is None or count < 0 or count > len(log):
+            return None
+        changes = [log[i] for i in range(len(log) - count, len(log))]
+        if changes[0][0] != version + 1 or any(x is None for _, x, _ in changes):
+            return None
+        return [(x, y) for _, x, y in changes]
+    
+    def neighbor_masks(self) -> bytearray:
+        """Flat (y * width + x) open-direction masks, building them if needed"""
+        if self._neighbor_masks is None:
+            return self.build_neighbor_index()
+        return self._neighbor_masks
+    
+    def iter_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Same result as get_neighbors, served from the neighbor index"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return self.get_neighbors(x, y)
+        masks = self._neighbor_masks
+        if masks is None:
+            masks = self.build_neighbor_index()
+        return [(x + dx, y + dy) for dx, dy in MASK_OFFSETS[masks[y * self.width + x]]]
+    
+    def _patch_neighbor_index(self, x: int, y: int, passable: bool):
+        # Toggling (x, y) flips the bit pointing at it in each adjacent cell
+        masks = self._neighbor_masks
+        for bit, (dx, dy) in enumerate(DIRECTIONS):
+            new_x, new_y = x + dx, y + dy
+            if 0 <= new_x < self.width and 0 <= new_y < self.height:
+                # The neighbor sees (x, y) in the opposite direction
+                back = 1 << ((bit + 2) % 4)
+                index = new_y * self.width + new_x
+                if passable:
+                    masks[index] |= back
+                else:
+                    masks[index] &= ~back
+    
     def get_all_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         neighbors = []
         directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]  # Up, Right, Down, Left
@@ -68,11 +199,9 @@ class Maze:
     
     def print_maze(self):
         symbols = {0: ' ', 1: '#', 2: 'S', 3: 'G'}
-        for row in self.grid:
+        for row in self.grid.tolist():
             print(''.join(symbols[cell] for cell in row))
     
     def clear_paths(self):
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] != 1:  # Not a wall
-                    self.grid[y][x] = 0  # Set to path 
\ No newline at end of file
+        # Reset every non-wall cell to plain path
+        self.grid[self.grid != 1] = 0
\ No newline at end of file
@@ -1,16 +1,82 @@
 import random
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, Optional, Iterator, Iterable
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import permutations
+
+import numpy as np
 
 from maze.maze import Maze
+from maze.maze_io import MazeCache
+
+# Every ordering of the carving directions: up, right, down, left
+CARVE_ORDERS = list(permutations([(0, -2), (2, 0), (0, 2), (-2, 0)]))
+
+class RandomFrontier:
+    """Set of flat cell ids with O(1) add, membership and random removal"""
+    
+    def __init__(self, capacity: int, rng=random):
+        self.rng = rng
+        self.items = []
+        # Position of each id in items, -1 when absent
+        self.positions = array('i', [-1]) * capacity
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def __contains__(self, item: int) -> bool:
+        return self.positions[item] >= 0
+    
+    def add(self, item: int):
+        if self.positions[item] < 0:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+    
+    def pop_random(self) -> int:
+        # Swap a random item with the last one, then pop
+        index = self.rng.randrange(len(self.items))
+        item = self.items[index]
+        last = self.items.pop()
+        if last != item:
+            self.items[index] = last
+            self.positions[last] = index
+        self.positions[item] = -1
+        return item
+
+def _generate_seeded(width: int, height: int, algorithm: str, placement: str,
+                     seed: int, cache: Optional[MazeCache] = None) -> Tuple[int, Maze]:
+    # Module-level so process pools can pickle it
+    generator = MazeGenerator(width, height, cache=cache)
+    return seed, generator.generate_maze(algorithm, placement=placement, seed=seed)
 
 class MazeGenerator:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, seed: Optional[int] = None,
+                 cache: Optional[MazeCache] = None):
         self.width = width
         self.height = height
+        # Without a seed, share the global random module as before
+        self.rng = random.Random(seed) if seed is not None else random
+        self.cache = cache
     
-    def generate_maze(self, algorithm: str = "recursive_backtracking") -> Maze:
-        maze = Maze(self.width, self.height)
+    def generate_maze(self, algorithm: str = "recursive_backtracking",
+                      maze: Optional[Maze] = None, placement: str = "corners",
+                      seed: Optional[int] = None) -> Maze:
+        # A seed reseeds this generator so the result depends on it alone
+        if seed is not None:
+            self.rng = random.Random(seed)
+        
+        # Seeded mazes are reproducible, so they can come from the cache
+        use_cache = self.cache is not None and seed is not None and maze is None
+        if use_cache:
+            cached = self.cache.get(self.width, self.height, algorithm, seed, placement)
+            if cached is not None:
+                # Unpacked so a hit has the same type as a freshly generated maze
+                return cached.unpack()
+        
+        # Carve into a caller-provided maze (e.g. a BitPackedMaze) if given
+        if maze is None:
+            maze = Maze(self.width, self.height)
         
         if algorithm == "recursive_backtracking":
             self._recursive_backtracking(maze)
@@ -18,23 +84,88 @@ class MazeGenerator:
             self._kruskal_algorithm(maze)
         elif algorithm == "prim":
             self._prim_algorithm(maze)
+        elif algorithm == "eller":
+            self._eller_algorithm(maze)
         else:
             self._recursive_backtracking(maze)
         
         # Set start and goal positions
-        self._set_start_and_goal(maze)
+        self._set_start_and_goal(maze, placement)
+        
+        if use_cache:
+            self.cache.put(maze, algorithm, seed, placement)
         
         return maze
     
+    def generate_many(self, count: int, seeds: Optional[Iterable[int]] = None,
+                      workers: Optional[int] = None,
+                      algorithm: str = "recursive_backtracking",
+                      placement: str = "corners") -> Iterator[Tuple[int, Maze]]:
+        """Generate count mazes in a process pool, yielding (seed, maze) as each finishes.
+        
+        Every maze is built by a fresh generator seeded with its own seed, so
+        the same seed always gives the same maze whatever the worker count.
+        Seeds default to draws from this generator's RNG. workers=1 runs in
+        this process without a pool.
+        """
+        if seeds is None:
+            seeds = [self.rng.getrandbits(63) for _ in range(count)]
+        else:
+            seeds = list(seeds)
+            if len(seeds) != count:
+                raise ValueError(f"expected {count} seeds, got {len(seeds)}")
+        
+        if workers == 1:
+            for seed in seeds:
+                yield _generate_seeded(self.width, self.height, algorithm, placement,
+                                       seed, self.cache)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_generate_seeded, self.width, self.height,
+                                   algorithm, placement, seed, self.cache)
+                       for seed in seeds]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Consumer stopped early: drop the tasks that have not started
+                for future in futures:
+                    future.cancel()
+    
+    def iter_generate(self, maze: Maze, algorithm: str = "recursive_backtracking",
+                      placement: str = "corners") -> Iterator[Tuple[int, int]]:
+        """Carve maze progressively, yielding each cell as it is opened"""
+        if algorithm in ("kruskal", "prim"):
+            # Batch algorithms: carve everything, then report the open cells
+            if algorithm == "kruskal":
+                self._kruskal_algorithm(maze)
+            else:
+                self._prim_algorithm(maze)
+            for y in range(maze.height):
+                for x in np.flatnonzero(maze.get_row(y) != 1).tolist():
+                    yield (x, y)
+        elif algorithm == "eller":
+            yield from self._iter_eller(maze)
+        elif algorithm == "recursive_backtracking":
+            yield from self._iter_recursive_backtracking(maze)
+        else:
+            raise ValueError(f"unknown maze algorithm {algorithm!r}")
+        
+        # Set start and goal positions once the maze is complete
+        self._set_start_and_goal(maze, placement)
+    
     def _recursive_backtracking(self, maze: Maze):
+        # Drain the carving generator without keeping the yielded cells
+        deque(self._iter_recursive_backtracking(maze), maxlen=0)
+    
+    def _iter_recursive_backtracking(self, maze: Maze) -> Iterator[Tuple[int, int]]:
         # Start with all walls
-        for y in range(maze.height):
-            for x in range(maze.width):
-                maze.set_cell(x, y, 1)
+        maze.fill(1)
         
         # Start from a random cell
-        start_x = random.randint(0, maze.width - 1)
-        start_y = random.randint(0, maze.height - 1)
+        start_x = self.rng.randint(0, maze.width - 1)
+        start_y = self.rng.randint(0, maze.height - 1)
         
         # Ensure start position is odd (for proper maze structure)
         if start_x % 2 == 0:
@@ -42,166 +173,301 @@ class MazeGenerator:
         if start_y % 2 == 0:
             start_y = max(1, start_y - 1)
         
-        self._carve_path(maze, start_x, start_y)
+        yield from self._carve_path(maze, start_x, start_y)
     
-    def _carve_path(self, maze: Maze, x: int, y: int):
-        # Mark current cell as path
+    def _carve_path(self, maze: Maze, x: int, y: int) -> Iterator[Tuple[int, int]]:
+        # Explicit stack of (x, y, remaining directions) replaces recursion,
+        # visiting cells in the same order the recursive version did
         maze.set_cell(x, y, 0)
+        yield (x, y)
+        stack = [(x, y, self._shuffled_directions())]
+        max_x, max_y = maze.width - 1, maze.height - 1
         
-        # Define directions: up, right, down, left
-        directions = [(0, -2), (2, 0), (0, 2), (-2, 0)]
-        random.shuffle(directions)
+        # Carved cells all sit on the odd lattice; tracking them in a compact
+        # local table is much cheaper than reading the maze back per step
+        columns = maze.width // 2 + 1
+        carved = bytearray(columns * (maze.height // 2 + 1))
+        carved[(y >> 1) * columns + (x >> 1)] = 1
         
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
+        while stack:
+            x, y, directions = stack[-1]
             
-            # Check if new position is within bounds and is a wall
-            if (0 < new_x < maze.width - 1 and 
-                0 < new_y < maze.height - 1 and 
-                maze.get_cell(new_x, new_y) == 1):
-                
-                # Carve wall between current and new cell
-                wall_x = x + dx // 2
-                wall_y = y + dy // 2
-                maze.set_cell(wall_x, wall_y, 0)
+            for dx, dy in directions:
+                new_x, new_y = x + dx, y + dy
                 
-                # Recursively carve from new cell
-                self._carve_path(maze, new_x, new_y)
+                # Check if new position is within bounds and is a wall
+                if (0 < new_x < max_x and 
+                    0 < new_y < max_y and 
+                    not carved[(new_y >> 1) * columns + (new_x >> 1)]):
+                    
+                    # Carve wall between current and new cell
+                    wall_x = x + dx // 2
+                    wall_y = y + dy // 2
+                    maze.set_cell(wall_x, wall_y, 0)
+                    maze.set_cell(new_x, new_y, 0)
+                    carved[(new_y >> 1) * columns + (new_x >> 1)] = 1
+                    yield (wall_x, wall_y)
+                    yield (new_x, new_y)
+                    
+                    # Continue carving from new cell
+                    stack.append((new_x, new_y, self._shuffled_directions()))
+                    break
+            else:
+                # All directions tried, backtrack
+                stack.pop()
+    
+    def _shuffled_directions(self) -> Iterator[Tuple[int, int]]:
+        # One random draw picks among all orderings of up, right, down, left
+        return iter(self.rng.choice(CARVE_ORDERS))
     
     def _kruskal_algorithm(self, maze: Maze):
         # Initialize with all walls
-        for y in range(maze.height):
-            for x in range(maze.width):
-                maze.set_cell(x, y, 1)
-        
-        # Create edges between cells
-        edges = []
-        for y in range(1, maze.height - 1, 2):
-            for x in range(1, maze.width - 1, 2):
-                # Add edges to right and down neighbors
-                if x + 2 < maze.width:
-                    edges.append(((x, y), (x + 2, y)))
-                if y + 2 < maze.height:
-                    edges.append(((x, y), (x, y + 2)))
-        
-        random.shuffle(edges)
-        
-        # Union-Find data structure
-        parent = {}
-        rank = {}
-        
-        def find(x):
-            if x not in parent:
-                parent[x] = x
-                rank[x] = 0
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-        
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px == py:
-                return False
-            if rank[px] < rank[py]:
-                parent[px] = py
-            elif rank[px] > rank[py]:
-                parent[py] = px
-            else:
-                parent[py] = px
-                rank[px] += 1
-            return True
-        
-        # Process edges
-        for (x1, y1), (x2, y2) in edges:
-            if union((x1, y1), (x2, y2)):
-                # Carve path between cells
-                wall_x = (x1 + x2) // 2
-                wall_y = (y1 + y2) // 2
-                maze.set_cell(wall_x, wall_y, 0)
-                maze.set_cell(x1, y1, 0)
-                maze.set_cell(x2, y2, 0)
+        maze.fill(1)
+        
+        # Cells sit on the odd lattice; cell (x, y) gets the flat id
+        # (y // 2) * columns + x // 2
+        columns = maze.width // 2
+        xs = np.arange(1, maze.width - 1, 2)
+        ys = np.arange(1, maze.height - 1, 2)
+        
+        # Create edges to right and down neighbors in one vectorized pass
+        right_xs = xs[xs + 2 < maze.width]
+        down_ys = ys[ys + 2 < maze.height]
+        right = ((ys // 2)[:, None] * columns + (right_xs // 2)[None, :]).ravel()
+        down = ((down_ys // 2)[:, None] * columns + (xs // 2)[None, :]).ravel()
+        first = np.concatenate([right, down])
+        second = np.concatenate([right + 1, down + columns])
+        
+        # Shuffle with a NumPy generator seeded from the maze generator's RNG
+        order = np.random.default_rng(self.rng.getrandbits(64)).permutation(len(first))
+        first, second = first[order], second[order]
+        
+        # Union-Find over flat ids with preallocated parent/rank arrays
+        node_count = columns * (maze.height // 2)
+        parent = array('i', range(node_count))
+        rank = bytearray(node_count)
+        accepted = bytearray(len(first))
+        
+        # Process edges in chunks to bound the size of the Python-side lists
+        chunk = 1 << 16
+        for offset in range(0, len(first), chunk):
+            pairs = zip(first[offset:offset + chunk].tolist(),
+                        second[offset:offset + chunk].tolist())
+            for index, (a, b) in enumerate(pairs, offset):
+                # Iterative find with path halving
+                while parent[a] != a:
+                    parent[a] = parent[parent[a]]
+                    a = parent[a]
+                while parent[b] != b:
+                    parent[b] = parent[parent[b]]
+                    b = parent[b]
+                if a == b:
+                    continue
+                
+                # Union by rank
+                if rank[a] < rank[b]:
+                    parent[a] = b
+                elif rank[a] > rank[b]:
+                    parent[b] = a
+                else:
+                    parent[b] = a
+                    rank[a] += 1
+                accepted[index] = 1
+        
+        # Carve both cells of every accepted edge and the wall between them
+        keep = np.frombuffer(accepted, dtype=np.uint8).astype(bool)
+        first, second = first[keep], second[keep]
+        x1, y1 = (first % columns) * 2 + 1, (first // columns) * 2 + 1
+        x2, y2 = (second % columns) * 2 + 1, (second // columns) * 2 + 1
+        maze.set_cells(np.concatenate([x1, x2, (x1 + x2) // 2]),
+                       np.concatenate([y1, y2, (y1 + y2) // 2]), 0)
     
     def _prim_algorithm(self, maze: Maze):
         # Initialize with all walls
-        for y in range(maze.height):
-            for x in range(maze.width):
-                maze.set_cell(x, y, 1)
+        maze.fill(1)
         
         # Start from a random cell
-        start_x = random.randint(1, maze.width - 2)
-        start_y = random.randint(1, maze.height - 2)
+        start_x = self.rng.randint(1, maze.width - 2)
+        start_y = self.rng.randint(1, maze.height - 2)
         if start_x % 2 == 0:
             start_x = max(1, start_x - 1)
         if start_y % 2 == 0:
             start_y = max(1, start_y - 1)
         
+        # Cells sit on the odd lattice and are tracked by flat id
+        columns = maze.width // 2
+        node_count = columns * (maze.height // 2)
+        visited = bytearray(node_count)
+        frontier = RandomFrontier(node_count, self.rng)
+        directions = [(0, -2), (2, 0), (0, 2), (-2, 0)]
+        
+        def in_bounds(x: int, y: int) -> bool:
+            return 0 < x < maze.width - 1 and 0 < y < maze.height - 1
+        
         # Mark start as visited
-        visited = {(start_x, start_y)}
+        visited[(start_y >> 1) * columns + (start_x >> 1)] = 1
         maze.set_cell(start_x, start_y, 0)
         
-        # Add walls to frontier
-        frontier = set()
-        for dx, dy in [(0, -2), (2, 0), (0, 2), (-2, 0)]:
+        # Add unvisited cells next to the start to the frontier
+        for dx, dy in directions:
             new_x, new_y = start_x + dx, start_y + dy
-            if (0 < new_x < maze.width - 1 and 
-                0 < new_y < maze.height - 1):
-                frontier.add((new_x, new_y))
+            if in_bounds(new_x, new_y):
+                frontier.add((new_y >> 1) * columns + (new_x >> 1))
         
         # Process frontier
         while frontier:
-            wall_x, wall_y = random.choice(list(frontier))
-            frontier.remove((wall_x, wall_y))
+            cell = frontier.pop_random()
+            x, y = (cell % columns) * 2 + 1, (cell // columns) * 2 + 1
             
-            # Find the two cells this wall separates
-            neighbors = []
-            for dx, dy in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
-                new_x, new_y = wall_x + dx, wall_y + dy
-                if (0 < new_x < maze.width - 1 and 
-                    0 < new_y < maze.height - 1):
-                    neighbors.append((new_x, new_y))
+            # Connect the cell to one random visited neighbor
+            visited_neighbors = []
+            for dx, dy in directions:
+                new_x, new_y = x + dx, y + dy
+                if in_bounds(new_x, new_y):
+                    if visited[(new_y >> 1) * columns + (new_x >> 1)]:
+                        visited_neighbors.append((new_x, new_y))
+                    else:
+                        frontier.add((new_y >> 1) * columns + (new_x >> 1))
             
-            # Check if exactly one neighbor is visited
-            visited_neighbors = [n for n in neighbors if n in visited]
-            if len(visited_neighbors) == 1:
-                # Carve the wall
-                maze.set_cell(wall_x, wall_y, 0)
-                
-                # Mark unvisited neighbor as visited
-                unvisited = [n for n in neighbors if n not in visited][0]
-                visited.add(unvisited)
-                maze.set_cell(unvisited[0], unvisited[1], 0)
-                
-                # Add new walls to frontier
-                for dx, dy in [(0, -2), (2, 0), (0, 2), (-2, 0)]:
-                    new_x, new_y = unvisited[0] + dx, unvisited[1] + dy
-                    if (0 < new_x < maze.width - 1 and 
-                        0 < new_y < maze.height - 1 and
-                        (new_x, new_y) not in visited):
-                        frontier.add((new_x, new_y))
-    
-    def _set_start_and_goal(self, maze: Maze):
-        # Find all path cells
-        path_cells = []
-        for y in range(maze.height):
-            for x in range(maze.width):
-                if maze.get_cell(x, y) == 0:  # Path cell
-                    path_cells.append((x, y))
-        
-        if len(path_cells) < 2:
+            link_x, link_y = self.rng.choice(visited_neighbors)
+            maze.set_cell((x + link_x) // 2, (y + link_y) // 2, 0)
+            maze.set_cell(x, y, 0)
+            visited[cell] = 1
+    
+    def _eller_algorithm(self, maze: Maze):
+        deque(self._iter_eller(maze), maxlen=0)
+    
+    def _iter_eller(self, maze: Maze) -> Iterator[Tuple[int, int]]:
+        # Rows below the last full cell row (even heights) stay walls
+        maze.fill(1)
+        for y, row in enumerate(self.iter_eller_rows((maze.height - 1) // 2, maze.width)):
+            maze.set_row(y, row)
+            # A row is final once written, so its open cells are reported straight away
+            for x in np.flatnonzero(row != 1).tolist():
+                yield (x, y)
+    
+    def iter_eller_rows(self, rows: Optional[int] = None,
+                        width: Optional[int] = None) -> Iterator[np.ndarray]:
+        """Yield grid rows top to bottom using Eller's algorithm.
+        
+        Only the current row's set labels are kept, so memory grows with the
+        width alone. With rows=None the stream never ends; otherwise `rows`
+        cell rows are produced and closed off, giving 2 * rows + 1 grid rows.
+        """
+        width = width or self.width
+        columns = (width - 1) // 2  # cell i sits at x = 2 * i + 1
+        sets = list(range(columns))
+        next_set = columns
+        
+        yield np.ones(width, dtype=np.uint8)  # Top border
+        
+        row = 0
+        while rows is None or row < rows:
+            last_row = rows is not None and row == rows - 1
+            cells = np.ones(width, dtype=np.uint8)
+            cells[1:2 * columns:2] = 0
+            
+            # Cells of each set, so a merge relabels only the smaller one
+            members = {}
+            for i, label in enumerate(sets):
+                members.setdefault(label, []).append(i)
+            
+            # Randomly join neighbors from different sets; the last row joins
+            # all of them so the finished maze is connected
+            for i in range(columns - 1):
+                if sets[i] != sets[i + 1] and (last_row or self.rng.random() < 0.5):
+                    cells[2 * i + 2] = 0
+                    kept, merged = sets[i], sets[i + 1]
+                    if len(members[kept]) < len(members[merged]):
+                        kept, merged = merged, kept
+                    moved = members.pop(merged)
+                    for j in moved:
+                        sets[j] = kept
+                    members[kept].extend(moved)
+            yield cells
+            
+            if last_row:
+                break
+            
+            # Every set carries on downwards through at least one cell.
+            # Regrouped in column order so seeded streams draw as before.
+            members = {}
+            for i, label in enumerate(sets):
+                members.setdefault(label, []).append(i)
+            
+            links = np.ones(width, dtype=np.uint8)
+            next_sets = [None] * columns
+            for label, indices in members.items():
+                chosen = [i for i in indices if self.rng.random() < 0.5]
+                for i in chosen or [self.rng.choice(indices)]:
+                    links[2 * i + 1] = 0
+                    next_sets[i] = label
+            
+            # Cells without a link above start a fresh set
+            for i in range(columns):
+                if next_sets[i] is None:
+                    next_sets[i] = next_set
+                    next_set += 1
+            sets = next_sets
+            yield links
+            row += 1
+        
+        yield np.ones(width, dtype=np.uint8)  # Bottom border
+    
+    def _set_start_and_goal(self, maze: Maze, placement: str = "corners"):
+        # First and last path cells in row-major order; if they coincide
+        # there are fewer than two path cells
+        first = self._first_path_cell(maze, range(maze.height))
+        last = self._first_path_cell(maze, range(maze.height - 1, -1, -1), last=True)
+        if first is None or first == last:
+            return
+        
+        if placement == "max_difficulty":
+            # Two BFS sweeps: the cell farthest from anywhere is one end of
+            # the longest shortest path, the cell farthest from it the other
+            start = self._farthest_cell(maze, first)
+            goal = self._farthest_cell(maze, start)
+            maze.set_start(*start)
+            maze.set_goal(*goal)
             return
         
         # Set start position (top-left area)
-        start_candidates = [(x, y) for x, y in path_cells 
-                           if x < maze.width // 3 and y < maze.height // 3]
-        if start_candidates:
-            maze.set_start(*random.choice(start_candidates))
-        else:
-            maze.set_start(*path_cells[0])
+        start = self._random_path_cell(maze, 0, 0, maze.width // 3, maze.height // 3)
+        maze.set_start(*(start or first))
         
         # Set goal position (bottom-right area)
-        goal_candidates = [(x, y) for x, y in path_cells 
-                          if x > 2 * maze.width // 3 and y > 2 * maze.height // 3]
-        if goal_candidates:
-            maze.set_goal(*random.choice(goal_candidates))
-        else:
-            maze.set_goal(*path_cells[-1]) 
\ No newline at end of file
+        goal_x, goal_y = 2 * maze.width // 3 + 1, 2 * maze.height // 3 + 1
+        goal = self._random_path_cell(maze, goal_x, goal_y,
+                                      maze.width - goal_x, maze.height - goal_y)
+        maze.set_goal(*(goal or last))
+    
+    def _first_path_cell(self, maze: Maze, rows: range,
+                         last: bool = False) -> Optional[Tuple[int, int]]:
+        for y in rows:
+            xs = np.flatnonzero(maze.get_row(y) == 0)
+            if len(xs):
+                return (int(xs[-1] if last else xs[0]), y)
+        return None
+    
+    def _random_path_cell(self, maze: Maze, x: int, y: int,
+                          width: int, height: int) -> Optional[Tuple[int, int]]:
+        # Pick uniformly among the path cells of a region with one array mask
+        region = maze.get_region(x, y, width, height)
+        candidates = np.flatnonzero(region == 0)
+        if not len(candidates):
+            return None
+        index = int(candidates[self.rng.randrange(len(candidates))])
+        return (x + index % region.shape[1], y + index // region.shape[1])
+    
+    def _farthest_cell(self, maze: Maze, source: Tuple[int, int]) -> Tuple[int, int]:
+        # Plain BFS; the last cell dequeued is the farthest from source
+        queue = deque([source])
+        visited = {source}
+        current = source
+        while queue:
+            current = queue.popleft()
+            for neighbor in maze.iter_neighbors(*current):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+        return current
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Compact binary maze files and an on-disk generation cache.
+
+File layout (little endian):
+    64-byte header: magic, format version, flags, width, height,
+                    start x/y, goal x/y (-1 when unset), seed, generator name
+    cell data:      one wall bit per cell, rows padded to whole bytes,
+                    i.e. exactly the BitPackedMaze layout
+
+Because the cell data matches BitPackedMaze, loading maps the file and
+wraps it without copying or decoding anything.
+"""
+import os
+import struct
+import tempfile
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from maze.maze import Maze
+from maze.packed_maze import BitPackedMaze
+
+MAGIC = b"MAZE"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIiiiiq24s")
+HEADER_SIZE = 64
+FLAG_HAS_SEED = 1
+GENERATOR_BYTES = 24  # UTF-8 bytes of generator name in the header
+
+# Rows packed per write, bounds the memory used while saving
+SAVE_BAND_ROWS = 1024
+
+class MazeHeader(NamedTuple):
+    width: int
+    height: int
+    start: Optional[Tuple[int, int]]
+    goal: Optional[Tuple[int, int]]
+    generator: str
+    seed: Optional[int]
+
+def save_maze(maze: Maze, path: str, generator: str = "", seed: Optional[int] = None):
+    # Checked up front so a bad header never leaves a partial file behind
+    if seed is not None and not -2 ** 63 <= seed < 2 ** 63:
+        raise ValueError(f"seed {seed} does not fit the header's signed 64-bit field")
+    name = generator.encode()
+    if len(name) > GENERATOR_BYTES:
+        raise ValueError(f"generator name {generator!r} is longer than {GENERATOR_BYTES} UTF-8 bytes")
+    
+    start = maze.get_start_position() or (-1, -1)
+    goal = maze.get_goal_position() or (-1, -1)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_HAS_SEED if seed is not None else 0,
+                         maze.width, maze.height, start[0], start[1], goal[0], goal[1],
+                         seed if seed is not None else 0, name)
+    
+    with open(path, "wb") as file:
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        for y in range(0, maze.height, SAVE_BAND_ROWS):
+            band = maze.get_region(0, y, maze.width, SAVE_BAND_ROWS)
+            file.write(np.packbits(band == 1, axis=1, bitorder='little').tobytes())
+
+def read_header(path: str) -> MazeHeader:
+    with open(path, "rb") as file:
+        data = file.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"{path}: truncated maze header")
+    
+    (magic, version, flags, width, height, start_x, start_y,
+     goal_x, goal_y, seed, generator) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a maze file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported maze format version {version}")
+    
+    return MazeHeader(width, height,
+                      (start_x, start_y) if start_x >= 0 else None,
+                      (goal_x, goal_y) if goal_x >= 0 else None,
+                      generator.rstrip(b"\0").decode(),
+                      seed if flags & FLAG_HAS_SEED else None)
+
+def load_maze(path: str, mode: str = "c") -> BitPackedMaze:
+    """Map a maze file without copying it.
+    
+    The default copy-on-write mode keeps edits in memory; use "r+" to
+    write them back to the file or "r" for a read-only maze.
+    """
+    header = read_header(path)
+    expected = HEADER_SIZE + header.height * ((header.width + 7) // 8)
+    if os.path.getsize(path) < expected:
+        raise ValueError(f"{path}: truncated maze data")
+    
+    maze = BitPackedMaze(header.width, header.height, path=path, mode=mode,
+                         offset=HEADER_SIZE)
+    # Markers live beside the bits, so this works on read-only maps too
+    maze.set_markers(header.start, header.goal)
+    return maze
+
+class MazeCache:
+    """Directory of generated mazes keyed by (width, height, algorithm, seed).
+    
+    Entries are evicted least recently used first once the directory
+    grows past max_bytes.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+    
+    def path_for(self, width: int, height: int, algorithm: str, seed: int,
+                 placement: str = "corners") -> str:
+        # Placement changes start/goal, so it is part of the key as well
+        name = f"{width}x{height}-{algorithm}-{placement}-{seed}.maze"
+        return os.path.join(self.directory, name)
+    
+    def get(self, width: int, height: int, algorithm: str, seed: int,
+            placement: str = "corners") -> Optional[BitPackedMaze]:
+        path = self.path_for(width, height, algorithm, seed, placement)
+        try:
+            maze = load_maze(path)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # Mark as recently used
+        return maze
+    
+    def put(self, maze: Maze, algorithm: str, seed: int, placement: str = "corners"):
+        path = self.path_for(maze.width, maze.height, algorithm, seed, placement)
+        
+        # Write to a temporary file first so readers never see partial data
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            save_maze(maze, temp_path, algorithm, seed)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self.evict(keep=path)
+    
+    def evict(self, keep: Optional[str] = None):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".maze"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Removed by another process
+                entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
\ No newline at end of file
@@ -0,0 +1,102 @@
+from typing import List, Tuple, Iterator, Optional
+
+import numpy as np
+
+from maze.maze import Maze, DIRECTIONS, MASK_OFFSETS
+
+class MazeWindow(Maze):
+    """Sliding band of rows over an unbounded row stream.
+    
+    Coordinates are absolute: row y of the stream stays row y while it is
+    in the band, and reads outside the band behave like out-of-bounds
+    cells (walls). Advancing pulls new rows from the stream and discards
+    the oldest ones, so memory stays at band_height * width cells.
+    """
+    
+    def __init__(self, rows: Iterator[np.ndarray], width: int, band_height: int):
+        super().__init__(width, band_height)
+        self.rows = rows
+        self.top = 0  # Absolute index of the first row in the band
+        self.exhausted = False
+        
+        # Load the first band
+        for y in range(band_height):
+            self.grid[y] = self._next_row()
+    
+    def _next_row(self) -> np.ndarray:
+        if not self.exhausted:
+            try:
+                return next(self.rows)
+            except StopIteration:
+                self.exhausted = True
+        return np.ones(self.width, dtype=np.uint8)  # Pad with walls
+    
+    def advance(self, count: int = 1):
+        """Drop the `count` oldest rows and pull as many new ones"""
+        if count <= 0:
+            return
+        kept = max(0, self.height - count)
+        self.grid[:kept] = self.grid[self.height - kept:]
+        
+        # Rows skipped entirely (count > band) are read and thrown away
+        for _ in range(count - self.height):
+            self._next_row()
+        for y in range(kept, self.height):
+            self.grid[y] = self._next_row()
+        
+        self.top += count
+        self.invalidate_neighbor_index()
+    
+    def keep_in_view(self, y: int, margin: int = 0):
+        """Advance until row y has at least `margin` rows below it in the band"""
+        self.advance(y + margin + 1 - (self.top + self.height))
+    
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and self.top <= y < self.top + self.height
+    
+    def row_range(self) -> Tuple[int, int]:
+        return self.top, self.top + self.height
+    
+    def get_cell(self, x: int, y: int) -> int:
+        return super().get_cell(x, y - self.top)
+    
+    def set_cell(self, x: int, y: int, value: int):
+        super().set_cell(x, y - self.top, value)
+    
+    def set_row(self, y: int, values: np.ndarray):
+        super().set_row(y - self.top, values)
+    
+    def get_row(self, y: int) -> np.ndarray:
+        return super().get_row(y - self.top)
+    
+    def get_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        return super().get_region(x, y - self.top, width, height)
+    
+    def changes_since(self, version: int) -> Optional[List[Tuple[int, int]]]:
+        # Logged rows are band-relative; advancing logs a bulk change, so
+        # every entry returned was made at the current top
+        changes = super().changes_since(version)
+        if changes is None:
+            return None
+        return [(x, y + self.top) for x, y in changes]
+    
+    def get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        neighbors = []
+        for dx, dy in DIRECTIONS:
+            new_x, new_y = x + dx, y + dy
+            if self.in_bounds(new_x, new_y) and self.is_path(new_x, new_y):
+                neighbors.append((new_x, new_y))
+        return neighbors
+    
+    def get_all_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        return [(new_x, new_y + self.top)
+                for new_x, new_y in super().get_all_neighbors(x, y - self.top)]
+    
+    def iter_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        if not self.in_bounds(x, y):
+            return self.get_neighbors(x, y)
+        masks = self._neighbor_masks
+        if masks is None:
+            masks = self.build_neighbor_index()
+        return [(x + dx, y + dy)
+                for dx, dy in MASK_OFFSETS[masks[(y - self.top) * self.width + x]]]
\ No newline at end of file
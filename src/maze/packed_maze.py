@@ -0,0 +1,181 @@
+from typing import List, Tuple, Optional
+
+import numpy as np
+
+from maze.maze import Maze, DIRECTIONS
+
+class BitPackedMaze(Maze):
+    """Maze storing one wall bit per cell, optionally in a memory-mapped file.
+    
+    Rows are padded to whole bytes so a row (or a band of rows) can be
+    unpacked on its own. When backed by a file, the OS pages rows in as
+    they are touched, so mazes larger than RAM can be generated and solved.
+    Start and goal markers are kept beside the bits instead of in them.
+    """
+    
+    def __init__(self, width: int, height: int, path: Optional[str] = None,
+                 mode: str = "w+", offset: int = 0):
+        self.width = width
+        self.height = height
+        self.row_bytes = (width + 7) // 8
+        
+        if path is None:
+            self.bits = np.full((height, self.row_bytes), 0xFF, dtype=np.uint8)
+        else:
+            self.bits = np.memmap(path, dtype=np.uint8, mode=mode, offset=offset,
+                                  shape=(height, self.row_bytes))
+            if mode == "w+":
+                self.bits.fill(0xFF)  # 1 = wall
+        
+        # Flat byte view for fast scalar access without numpy overhead
+        self._bytes = memoryview(self.bits).cast('B')
+        self._markers = {}  # (x, y) -> 2 (start) or 3 (goal)
+        self.start_pos = None
+        self.goal_pos = None
+        self._neighbor_masks = None
+        self.version = 0
+        self._change_log = None
+    
+    def get_cell(self, x: int, y: int) -> int:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            if self._bytes[y * self.row_bytes + (x >> 3)] >> (x & 7) & 1:
+                return 1
+            if self._markers:
+                return self._markers.get((x, y), 0)
+            return 0
+        return 1  # Return wall for out of bounds
+    
+    def set_cell(self, x: int, y: int, value: int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            index = y * self.row_bytes + (x >> 3)
+            bit = 1 << (x & 7)
+            if bool(self._bytes[index] & bit) != (value == 1):
+                self.version += 1
+                if self._change_log is not None:
+                    self._change_log.append((self.version, x, y))
+                if self._neighbor_masks is not None:
+                    self._patch_neighbor_index(x, y, value != 1)
+            if value == 1:
+                self._bytes[index] |= bit
+            else:
+                self._bytes[index] &= ~bit & 0xFF
+            
+            if value == 2 or value == 3:
+                self._markers[(x, y)] = value
+            elif self._markers:
+                self._markers.pop((x, y), None)
+    
+    def set_markers(self, start: Optional[Tuple[int, int]], goal: Optional[Tuple[int, int]]):
+        """Record start and goal without touching the wall bits"""
+        self.start_pos = start
+        self.goal_pos = goal
+        self._markers.clear()
+        if start is not None:
+            self._markers[start] = 2
+        if goal is not None:
+            self._markers[goal] = 3
+    
+    def fill(self, value: int):
+        self.bits.fill(0xFF if value == 1 else 0)
+        self._markers.clear()
+        self.invalidate_neighbor_index()
+    
+    def set_cells(self, xs: np.ndarray, ys: np.ndarray, value: int):
+        """Set every (xs[i], ys[i]) to value; coordinates must be in bounds"""
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        bits = (1 << (xs & 7)).astype(np.uint8)
+        # ufunc.at applies repeated byte indices one after another
+        if value == 1:
+            np.bitwise_or.at(self.bits, (ys, xs >> 3), bits)
+        else:
+            np.bitwise_and.at(self.bits, (ys, xs >> 3), ~bits)
+        self.invalidate_neighbor_index()
+        
+        if value == 2 or value == 3:
+            self._markers.update(((x, y), value) for x, y in zip(xs.tolist(), ys.tolist()))
+        elif self._markers:
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                self._markers.pop((x, y), None)
+    
+    def set_row(self, y: int, values: np.ndarray):
+        """Overwrite row y with values (one cell value per column)"""
+        self.bits[y] = np.packbits(np.asarray(values) == 1, bitorder='little')
+        self.invalidate_neighbor_index()
+        for x, value in enumerate(np.asarray(values).tolist()):
+            if value == 2 or value == 3:
+                self._markers[(x, y)] = value
+            elif self._markers:
+                self._markers.pop((x, y), None)
+    
+    def get_row(self, y: int) -> np.ndarray:
+        """Return a copy of row y, unpacked to one byte per cell"""
+        return self.get_region(0, y, self.width, 1)[0]
+    
+    def get_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Return an unpacked copy of the region, clipped to the maze bounds"""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = max(x0, min(self.width, x + width)), max(y0, min(self.height, y + height))
+        
+        # Only the bytes covering the requested columns are unpacked
+        first_byte = x0 >> 3
+        packed = self.bits[y0:y1, first_byte:(x1 + 7) >> 3]
+        cells = np.unpackbits(packed, axis=1, bitorder='little')
+        region = cells[:, x0 - first_byte * 8:x1 - first_byte * 8]
+        
+        for (mx, my), value in self._markers.items():
+            if x0 <= mx < x1 and y0 <= my < y1 and region[my - y0, mx - x0] == 0:
+                region[my - y0, mx - x0] = value
+        return region
+    
+    def passable_mask(self) -> np.ndarray:
+        """Boolean array, True where the cell is path, start or goal"""
+        return self.get_region(0, 0, self.width, self.height) != 1
+    
+    def unpack(self) -> Maze:
+        """Copy into a plain Maze, one byte per cell"""
+        maze = Maze(self.width, self.height)
+        maze.grid[:] = self.get_region(0, 0, self.width, self.height)
+        maze.start_pos = self.start_pos
+        maze.goal_pos = self.goal_pos
+        return maze
+    
+    def iter_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Same result as get_neighbors, read straight from the packed bits.
+        
+        A per-cell neighbor index would cost a byte per cell and defeat the
+        packing, so it is never built implicitly here.
+        """
+        data = self._bytes
+        row_bytes = self.row_bytes
+        neighbors = []
+        for dx, dy in DIRECTIONS:
+            new_x, new_y = x + dx, y + dy
+            if (0 <= new_x < self.width and
+                0 <= new_y < self.height and
+                not data[new_y * row_bytes + (new_x >> 3)] >> (new_x & 7) & 1):
+                neighbors.append((new_x, new_y))
+        return neighbors
+    
+    def print_maze(self):
+        symbols = {0: ' ', 1: '#', 2: 'S', 3: 'G'}
+        for y in range(self.height):
+            print(''.join(symbols[cell] for cell in self.get_row(y).tolist()))
+    
+    def clear_paths(self):
+        self._markers.clear()
+    
+    def __getstate__(self):
+        # memoryviews cannot be pickled; ship the bits as a plain array
+        state = self.__dict__.copy()
+        del state['_bytes']
+        state['bits'] = np.array(self.bits)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bytes = memoryview(self.bits).cast('B')
+    
+    def flush(self):
+        """Write pending changes of a file-backed maze to disk"""
+        if isinstance(self.bits, np.memmap):
+            self.bits.flush()
\ No newline at end of file
@@ -2,6 +2,8 @@
 Tests for AI Algorithms
 """
 
+import gc
+import random
 import unittest
 import sys
 import os
@@ -10,9 +12,25 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from maze.maze import Maze
+from maze.maze_generator import MazeGenerator
+from maze.maze_window import MazeWindow
 from ai.bfs import BFS
 from ai.astar import AStar
 from ai.dfs import DFS
+from ai.paths import PathTable
+from ai.flat_astar import FlatAStar, MAX_GENERATION
+from ai.bidirectional import BidirectionalBFS, BidirectionalAStar
+from ai.jps import JumpPointSearch
+from ai.distance_field import get_distance_field
+from ai.path_cache import PathCache
+from ai.dstar_lite import DStarLite
+from ai.hpa import HierarchicalPathfinder
+from ai.corridor_graph import CorridorGraph
+from ai.multi_agent import MultiAgentController
+from ai.async_planner import AsyncPlanner
+from ai.cooperative import CooperativePlanner, ReservationTable
+from ai import registry
+from ai.ai_controller import AIController
 
 class TestAI(unittest.TestCase):
     def setUp(self):
@@ -104,6 +122,565 @@ class TestAI(unittest.TestCase):
         """Test pathfinding to same position"""
         path = self.bfs.find_path((0, 0), (0, 0))
         self.assertEqual(path, [(0, 0)])
+    
+    def test_find_all_paths_view(self):
+        """Test the lazy path table returned by find_all_paths"""
+        paths = self.bfs.find_all_paths((0, 0))
+        
+        self.assertIsInstance(paths, PathTable)
+        self.assertEqual(len(paths), 9)
+        self.assertIn((4, 4), paths)
+        self.assertNotIn((4, 0), paths)
+        self.assertEqual(paths[(4, 4)], self.bfs.find_path((0, 0), (4, 4)))
+        self.assertEqual(paths[(0, 0)], [(0, 0)])
+        with self.assertRaises(KeyError):
+            paths[(4, 0)]
+    
+    def test_shortest_paths_on_large_maze(self):
+        """Test BFS and A* agree on path length in a large generated maze"""
+        maze = MazeGenerator(201, 201, seed=4).generate_maze()
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        
+        bfs_path = BFS(maze).find_path(start, goal)
+        astar_path = AStar(maze).find_path(start, goal)
+        
+        self.assertEqual(len(bfs_path), len(astar_path))
+        self.assertEqual((astar_path[0], astar_path[-1]), (start, goal))
+        for a, b in zip(astar_path, astar_path[1:]):
+            self.assertIn(b, maze.get_neighbors(*a))
+    
+    def test_flat_astar(self):
+        """Test the flat-index A* engine against BFS, across repeated calls"""
+        maze = MazeGenerator(61, 41, seed=8).generate_maze()
+        for x in range(2, 58, 6):
+            maze.set_cell(x, 20, 0)  # Open a few loops
+        flat = FlatAStar(maze)
+        bfs = BFS(maze)
+        goal = maze.get_goal_position()
+        
+        for start in [maze.get_start_position(), (1, 1), (59, 1), goal]:
+            path = flat.find_path(start, goal)
+            self.assertEqual(len(path), len(bfs.find_path(start, goal)))
+            self.assertEqual((path[0], path[-1]), (start, goal))
+        
+        # Arrays are reused, the generation stamp tells searches apart
+        arrays = flat.g_scores
+        self.assertEqual(flat.generation, 3)
+        
+        # Walls added after a search are respected by the next one
+        path = flat.find_path((1, 1), goal)
+        maze.set_cell(*path[len(path) // 2], 1)
+        self.assertEqual(len(flat.find_path((1, 1), goal)), len(bfs.find_path((1, 1), goal)))
+        self.assertIs(flat.g_scores, arrays)
+        
+        # 32-bit stamps start over on fresh arrays instead of wrapping
+        self.assertEqual(flat.seen.itemsize, 4)
+        flat.generation = MAX_GENERATION
+        self.assertEqual(len(flat.find_path((1, 1), goal)), len(bfs.find_path((1, 1), goal)))
+        self.assertEqual(flat.generation, 1)
+        
+        # Selectable from the controller
+        controller = AIController(maze, "astar_flat")
+        self.assertEqual(controller.get_path(), flat.find_path(maze.get_start_position(), goal))
+        
+        # Ids are band-local on a scrolled window
+        window = MazeWindow(MazeGenerator(21, 1, seed=8).iter_eller_rows(), 21, 40)
+        window.advance(60)
+        flat = FlatAStar(window)
+        bfs = BFS(window)
+        cells = [(x, y) for y in range(60, 100) for x in range(21) if window.is_path(x, y)]
+        for start, goal in zip(cells[:5], cells[-5:]):
+            path = flat.find_path(start, goal)
+            self.assertEqual(len(path), len(bfs.find_path(start, goal)))
+            if path:
+                self.assertEqual((path[0], path[-1]), (start, goal))
+    
+    def test_bidirectional_search(self):
+        """Test that bidirectional BFS and A* find shortest paths"""
+        for seed in range(5):
+            maze = MazeGenerator(41, 41, seed=seed).generate_maze()
+            # Open some walls so there are several shortest paths
+            rng = random.Random(seed)
+            for _ in range(150):
+                x, y = rng.randrange(1, 40), rng.randrange(1, 40)
+                if maze.is_wall(x, y):
+                    maze.set_cell(x, y, 0)
+            start, goal = maze.get_start_position(), maze.get_goal_position()
+            expected = len(BFS(maze).find_path(start, goal))
+            
+            for solver in (BidirectionalBFS(maze), BidirectionalAStar(maze)):
+                path = solver.find_path(start, goal)
+                self.assertEqual(len(path), expected)
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], goal)
+                for (x1, y1), (x2, y2) in zip(path, path[1:]):
+                    self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+                    self.assertTrue(maze.is_path(x2, y2))
+                self.assertEqual(solver.find_path(start, start), [start])
+        
+        # Unreachable goal
+        maze = Maze(5, 5)
+        maze.set_cell(1, 1, 0)
+        maze.set_cell(3, 3, 0)
+        self.assertEqual(BidirectionalBFS(maze).find_path((1, 1), (3, 3)), [])
+        self.assertEqual(BidirectionalAStar(maze).find_path((1, 1), (3, 3)), [])
+    
+    def test_jump_point_search(self):
+        """Test that JPS returns cell-by-cell shortest paths"""
+        rng = random.Random(0)
+        for size in (9, 15, 31):
+            # Open rooms with scattered pillars
+            maze = Maze(size, size)
+            for y in range(1, size - 1):
+                for x in range(1, size - 1):
+                    if rng.random() < 0.8:
+                        maze.set_cell(x, y, 0)
+            cells = [(x, y) for y in range(size) for x in range(size) if maze.is_path(x, y)]
+            solver = JumpPointSearch(maze)
+            
+            for _ in range(20):
+                start, goal = rng.choice(cells), rng.choice(cells)
+                path = solver.find_path(start, goal)
+                self.assertEqual(len(path), len(BFS(maze).find_path(start, goal)))
+                if path:
+                    self.assertEqual(path[0], start)
+                    self.assertEqual(path[-1], goal)
+                for (x1, y1), (x2, y2) in zip(path, path[1:]):
+                    self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+                    self.assertTrue(maze.is_path(x2, y2))
+        
+        # The padded grid is copied once, then again only after the maze changes
+        start = cells[0]
+        goal = list(BFS(maze).find_all_paths(start))[-1]  # Farthest reachable cell
+        path = solver.find_path(start, goal)
+        loaded = solver._cells
+        self.assertEqual(solver.find_path(start, goal), path)
+        self.assertIs(solver._cells, loaded)
+        maze.set_cell(*path[len(path) // 2], 1)
+        path = solver.find_path(start, goal)
+        self.assertIsNot(solver._cells, loaded)
+        self.assertEqual(len(path), len(BFS(maze).find_path(start, goal)))
+        
+        controller = AIController(self.maze, "jps")
+        self.assertEqual(controller.path[-1], self.maze.get_goal_position())
+    
+    def test_dfs_large_and_resumable(self):
+        """Test that DFS handles large mazes and can be paused and resumed"""
+        maze = MazeGenerator(401, 401, seed=3).generate_maze()
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        dfs = DFS(maze)
+        
+        # Perfect maze: the only path is the shortest one
+        path = dfs.find_path(start, goal)
+        self.assertEqual(path, BFS(maze).find_path(start, goal))
+        self.assertIn(goal, dfs.explore_area(start, max_depth=len(path)))
+        self.assertNotIn(goal, dfs.explore_area(start, max_depth=len(path) - 2))
+        
+        # Stepping in slices visits the same cells as running straight through
+        search = dfs.search(start, goal)
+        while not search.done:
+            before = search.expanded
+            search.step(1000)
+            self.assertLessEqual(search.expanded - before, 1000)
+            self.assertEqual(search.path[0], start)
+        self.assertEqual(search.path, path)
+        self.assertEqual(list(dfs.search(start, goal)), list(dfs.search(start, goal)))
+    
+    def test_distance_field(self):
+        """Test distance field steps, sharing and rebuild after edits"""
+        maze = MazeGenerator(61, 61, seed=5).generate_maze()
+        goal = maze.get_goal_position()
+        field = get_distance_field(maze, goal)
+        self.assertIs(get_distance_field(maze, goal), field)
+        
+        # Distances match BFS everywhere and next_step always gets closer
+        paths = BFS(maze).find_all_paths(goal)
+        for y in range(maze.height):
+            for x in range(maze.width):
+                if (x, y) in paths:
+                    self.assertEqual(field.distance(x, y), len(paths[(x, y)]) - 1)
+                    if (x, y) != goal:
+                        self.assertEqual(field.distance(*field.next_step(x, y)), field.distance(x, y) - 1)
+                else:
+                    self.assertEqual(field.distance(x, y), -1)
+                    self.assertIsNone(field.next_step(x, y))
+        
+        # Controllers walk the shared field one step per move
+        controller = AIController(maze, "field")
+        self.assertIs(controller.field, field)
+        self.assertEqual(controller.get_path()[-1], goal)
+        for _ in range(field.distance(*maze.get_start_position())):
+            controller._move_along_path()
+        self.assertEqual(controller.get_position(), goal)
+        
+        # Editing the maze makes the next lookup rebuild the field
+        x, y = field.path_from(maze.get_start_position())[1]
+        maze.set_cell(x, y, 1)
+        self.assertIsNot(get_distance_field(maze, goal), field)
+    
+    def test_path_cache(self):
+        """Test path cache hits, suffix hits, eviction and invalidation"""
+        maze = MazeGenerator(31, 31, seed=2).generate_maze()
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        cache = PathCache(max_entries=2)
+        bfs = BFS(maze)
+        
+        path = cache.find_path(maze, "bfs", bfs, start, goal)
+        self.assertEqual(cache.find_path(maze, "bfs", bfs, start, goal), path)
+        # Any cell on a cached shortest path is answered by its suffix
+        self.assertEqual(cache.get(maze, "bfs", path[5], goal), path[5:])
+        self.assertEqual((cache.misses, cache.hits, cache.subpath_hits), (1, 1, 1))
+        # ...but only for the same algorithm, and never for DFS paths
+        self.assertIsNone(cache.get(maze, "astar", path[5], goal))
+        cache.put(maze, "dfs", start, goal, path, shortest=False)
+        self.assertIsNone(cache.get(maze, "dfs", path[5], goal))
+        
+        # Least recently used entries go first
+        cache.put(maze, "astar", start, goal, path)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(maze, "bfs", start, goal))
+        
+        # Editing the maze drops its entries
+        maze.set_cell(*path[1], 1)
+        self.assertIsNone(cache.get(maze, "astar", start, goal))
+        self.assertEqual(len(cache), 0)
+        
+        # Controllers on the same maze share the default cache
+        maze = MazeGenerator(31, 31, seed=4).generate_maze()
+        first = AIController(maze, "bfs")
+        hits = first.path_cache.hits
+        second = AIController(maze, "bfs")
+        self.assertEqual(second.path, first.path)
+        self.assertEqual(second.path_cache.hits, hits + 1)
+        
+        # Entries go away with their maze
+        cache = PathCache()
+        cache.put(maze, "bfs", start, goal, path)
+        del maze, first, second
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+    
+    def test_dstar_lite_replanning(self):
+        """Test that D* Lite repairs paths after cells toggle"""
+        maze = MazeGenerator(41, 41, seed=7).generate_maze()
+        rng = random.Random(7)
+        for _ in range(100):
+            maze.set_cell(rng.randrange(1, 40), rng.randrange(1, 40), 0)
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        planner = DStarLite(maze)
+        
+        path = planner.find_path(start, goal)
+        initial = planner.nodes_expanded
+        self.assertEqual(len(path), len(BFS(maze).find_path(start, goal)))
+        
+        pos = start
+        for _ in range(30):
+            x, y = rng.randrange(1, 40), rng.randrange(1, 40)
+            if (x, y) in (pos, goal):
+                continue
+            maze.set_cell(x, y, 0 if maze.is_wall(x, y) else 1)
+            path = planner.find_path(pos, goal)
+            self.assertEqual(len(path), len(BFS(maze).find_path(pos, goal)))
+            if len(path) > 2:
+                pos = path[2]
+        
+        # A change next to the agent is repaired locally
+        planner.find_path(pos, goal)
+        maze.set_cell(*planner.find_path(pos, goal)[1], 1)
+        planner.find_path(pos, goal)
+        self.assertLess(planner.nodes_expanded, initial)
+        
+        # Bulk writes cannot be listed, so the next call starts over
+        maze.fill(0)
+        self.assertEqual(len(planner.find_path((1, 1), (3, 1))), 3)
+    
+    def test_hierarchical_pathfinding(self):
+        """Test HPA* paths and per-cluster updates after edits"""
+        rng = random.Random(11)
+        for seed in range(3):
+            maze = MazeGenerator(63, 63, seed=seed).generate_maze()
+            hpa = HierarchicalPathfinder(maze, cluster_size=8)
+            cells = [(x, y) for y in range(63) for x in range(63) if maze.is_path(x, y)]
+            
+            for _ in range(15):
+                start, goal = rng.choice(cells), rng.choice(cells)
+                path = hpa.find_path(start, goal)
+                # Perfect maze: the only simple path is the shortest one
+                self.assertEqual(path, BFS(maze).find_path(start, goal))
+            
+            # Block a cell and open a wall; only their clusters are rebuilt
+            edges = dict(hpa.edges)
+            maze.set_cell(*path[len(path) // 2], 1)
+            maze.set_cell(2, 1, 0)
+            hpa.update()
+            changed = {cluster for cluster in edges if hpa.edges[cluster] is not edges[cluster]}
+            self.assertLessEqual(len(changed), 4)
+            
+            for _ in range(15):
+                start, goal = rng.choice(cells), rng.choice(cells)
+                if maze.is_wall(*start) or maze.is_wall(*goal):
+                    continue
+                path = hpa.find_path(start, goal)
+                expected = BFS(maze).find_path(start, goal)
+                self.assertEqual(bool(path), bool(expected))
+                self.assertGreaterEqual(len(path), len(expected))
+                for (x1, y1), (x2, y2) in zip(path, path[1:]):
+                    self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+                    self.assertTrue(maze.is_path(x2, y2))
+    
+    def test_corridor_graph(self):
+        """Test corridor graph paths on perfect, braided and open mazes"""
+        rng = random.Random(5)
+        for seed in range(6):
+            maze = MazeGenerator(41, 41, seed=seed).generate_maze()
+            if seed % 2:
+                # Knock out walls to create loops and open areas
+                for _ in range(150):
+                    maze.set_cell(rng.randrange(1, 40), rng.randrange(1, 40), 0)
+            graph = CorridorGraph(maze)
+            if seed % 2 == 0:
+                self.assertEqual(graph.core_cells, 0)  # Perfect maze: all trees
+            cells = [(x, y) for y in range(41) for x in range(41) if maze.is_path(x, y)]
+            
+            for _ in range(20):
+                start, goal = rng.choice(cells), rng.choice(cells)
+                path = graph.find_path(start, goal)
+                self.assertEqual(len(path), len(BFS(maze).find_path(start, goal)))
+                self.assertEqual((path[0], path[-1]), (start, goal))
+                for (x1, y1), (x2, y2) in zip(path, path[1:]):
+                    self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+                    self.assertTrue(maze.is_path(x2, y2))
+        
+        # Edits are picked up on the next query
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        maze.set_cell(*graph.find_path(start, goal)[5], 1)
+        self.assertEqual(len(graph.find_path(start, goal)), len(BFS(maze).find_path(start, goal)))
+    
+    def test_multi_agent_controller(self):
+        """Test batched agents reach their goals along shortest paths"""
+        maze = MazeGenerator(31, 31, seed=4).generate_maze()
+        rng = random.Random(4)
+        cells = [(x, y) for y in range(31) for x in range(31) if maze.is_path(x, y)]
+        starts = [rng.choice(cells) for _ in range(50)]
+        goals = [rng.choice([maze.get_goal_position(), (1, 1)]) for _ in starts]
+        agents = MultiAgentController(maze, starts, goals)
+        
+        self.assertEqual(len(agents.goals), 2)  # One shared field per goal
+        # A perfect maze has one path per pair, so every step is known
+        paths = [BFS(maze).find_path(start, goal) for start, goal in zip(starts, goals)]
+        self.assertEqual(agents.remaining.tolist(), [len(path) - 1 for path in paths])
+        self.assertEqual(agents.get_path(0), paths[0])
+        
+        for step in range(1, max(map(len, paths))):
+            agents.step()
+            self.assertEqual(agents.get_positions(), [path[min(step, len(path) - 1)] for path in paths])
+        self.assertTrue(agents.arrived().all())
+        
+        # An agent that cannot reach its goal counts as stuck, then wanders
+        maze.set_cell(1, 2, 1)
+        maze.set_cell(2, 1, 1)
+        agents.set_goal(0, (1, 1))
+        agents.reset([(3, 1)] * 50)
+        paths = [BFS(maze).find_path((3, 1), goal) for goal in goals]
+        for _ in range(12):
+            agents.step()
+        self.assertEqual(agents.remaining[0], -1)
+        self.assertIn(agents.get_position(0), maze.get_neighbors(3, 1))
+        for agent in range(1, 50):
+            if paths[agent]:
+                self.assertEqual(agents.get_position(agent), paths[agent][min(12, len(paths[agent]) - 1)])
+            else:
+                self.assertEqual(agents.remaining[agent], -1)
+        
+        # Agents off a scrolled band wait instead of reading another row's cells
+        window = MazeWindow(MazeGenerator(21, 1, seed=4).iter_eller_rows(), 21, 20)
+        window.advance(30)
+        inside = next((x, 40) for x in range(21) if window.is_path(x, 40))
+        agents = MultiAgentController(window, [(1, 10), inside], [inside, inside])
+        agents.step()
+        self.assertEqual(agents.get_position(0), (1, 10))
+        self.assertEqual(agents.remaining.tolist(), [-1, 0])
+    
+    def test_frame_budgeted_planning(self):
+        """Test that A* planning spread over frames still reaches the goal"""
+        maze = MazeGenerator(101, 101, seed=6).generate_maze()
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        shortest = BFS(maze).find_path(start, goal)
+        
+        search = AStar(maze).search(start, goal)
+        while not search.step(100):
+            self.assertEqual(search.expanded % 100, 0)
+            partial = search.partial_path()
+            self.assertEqual(partial[0], start)
+            self.assertEqual(search.route(partial[-1], shortest[:1])[-1], start)
+        self.assertEqual(search.path, shortest)
+        
+        # Off by default: the whole path is ready straight away
+        controller = AIController(maze, "astar", path_cache=PathCache())
+        self.assertIsNone(controller.search)
+        self.assertEqual(controller.get_path(), shortest)
+        
+        controller = AIController(maze, "astar", path_cache=PathCache(), planning_budget=50)
+        self.assertIsNotNone(controller.search)
+        walked = [start]
+        for _ in range(20 * len(shortest)):
+            expanded = controller.search.expanded if controller.search else None
+            controller.update()
+            if expanded is not None and controller.search is not None:
+                self.assertLessEqual(controller.search.expanded - expanded, 50)
+            if controller.get_position() != walked[-1]:
+                walked.append(controller.get_position())
+        
+        self.assertEqual(walked[-1], goal)
+        for (x1, y1), (x2, y2) in zip(walked, walked[1:]):
+            self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+    
+    def test_async_planner(self):
+        """Test off-thread planning, stale-result cancellation and counters"""
+        maze = MazeGenerator(61, 61, seed=8).generate_maze()
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        for kind in ("thread", "process"):
+            planner = AsyncPlanner(kind, max_workers=1)
+            try:
+                controller = AIController(maze, "bfs", path_cache=PathCache(), planner=planner)
+                self.assertEqual(controller.path, [])  # Nothing until a later tick
+                first = controller.pending_path[0]
+                
+                # A new goal makes the first plan stale
+                controller.set_goal((1, 1))
+                self.assertEqual(planner.cancelled + planner.discarded, 1)
+                controller.pending_path[0].result(timeout=30)
+                controller.update()
+                self.assertIsNone(controller.pending_path)
+                self.assertEqual(controller.path, BFS(maze).find_path(start, (1, 1)))
+                self.assertTrue(first.cancelled() or first.done())
+                
+                self.assertEqual(planner.queue_depth, 0)
+                self.assertGreaterEqual(planner.completed, 1)
+                self.assertGreater(planner.max_latency, 0)
+                self.assertGreaterEqual(planner.max_latency, planner.mean_latency)
+                
+                # A finished result is discarded, not counted as cancelled too
+                future = planner.submit(len, [start])
+                future.result(timeout=30)
+                cancelled, discarded = planner.cancelled, planner.discarded
+                planner.cancel(future)
+                self.assertEqual((planner.cancelled, planner.discarded), (cancelled, discarded + 1))
+            finally:
+                planner.shutdown()
+        
+        # A replan while the stale job still runs: each job has its own solver
+        maze = MazeGenerator(201, 201, seed=8).generate_maze()
+        start = maze.get_start_position()
+        planner = AsyncPlanner("thread", max_workers=2)
+        try:
+            controller = AIController(maze, "astar_flat", path_cache=PathCache(), planner=planner)
+            first = controller.pending_path[0]
+            controller.set_goal((1, 199))
+            second = controller.pending_path[0]
+            for future, goal in ((first, maze.get_goal_position()), (second, (1, 199))):
+                if not future.cancelled():
+                    self.assertEqual(future.result(timeout=30), BFS(maze).find_path(start, goal))
+            self.assertNotIn("astar_flat", controller.solvers)
+        finally:
+            planner.shutdown(wait=False)
+        
+        with self.assertRaises(ValueError):
+            AsyncPlanner("fibers")
+    
+    def test_solver_registry(self):
+        """Test lazy registered solvers and calibrated auto selection"""
+        maze = MazeGenerator(41, 41, seed=9).generate_maze()
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        controller = AIController(maze, "bfs", path_cache=PathCache())
+        self.assertEqual(list(controller.solvers), ["bfs"])  # Nothing else was built
+        
+        # A newly registered solver needs no controller changes
+        registry.register_solver("test_bfs", BFS)
+        try:
+            controller.switch_algorithm("test_bfs")
+            self.assertIsInstance(controller.solvers["test_bfs"], BFS)
+            self.assertEqual(controller.path, BFS(maze).find_path(start, goal))
+        finally:
+            del registry.SOLVERS["test_bfs"]
+        with self.assertRaises(ValueError):
+            registry.create_solver("test_bfs", maze)
+        
+        cells, density = registry.maze_features(maze)
+        self.assertEqual(cells, 41 * 41)
+        self.assertAlmostEqual(density, 1.0, places=2)  # Perfect maze
+        
+        def timing(query):
+            return {"build": 0.0, "query": query}
+        
+        calibration = {"points": [
+            {"cells": 1681, "density": 1.0, "solvers": {"bfs": timing(2), "jps": timing(1), "dfs": timing(0)}},
+            {"cells": 1681, "density": 1.5, "solvers": {"bfs": timing(1), "jps": timing(2)}},
+            {"cells": 10 ** 6, "density": 1.0, "solvers": {"bfs": timing(1), "jps": timing(2)}},
+        ]}
+        # Nearest point wins, and DFS is never picked since its paths are not shortest
+        self.assertEqual(registry.choose_solver(maze, calibration), "jps")
+        self.assertEqual(registry.choose_solver(maze, {"points": []}), "astar")
+        
+        controller.switch_algorithm("auto")
+        self.assertIn(controller.auto_choice[1], registry.SOLVERS)
+        self.assertEqual(len(controller.path), len(BFS(maze).find_path(start, goal)))
+    
+    def test_cooperative_planner(self):
+        """Test that cooperative agents reach their goals without colliding"""
+        table = ReservationTable()
+        table.reserve((1, 1), 0, 0)
+        table.reserve((2, 1), 1, 0)
+        self.assertFalse(table.can_move((1, 1), (2, 1), 0, 1))   # Cell taken
+        self.assertFalse(table.can_move((2, 1), (1, 1), 0, 1))   # Head-on swap
+        self.assertTrue(table.can_move((1, 1), (2, 1), 0, 0))
+        table.advance(1)
+        self.assertEqual(len(table), 1)
+        
+        # Two agents swapping ends of a corridor: one steps into the side pocket
+        maze = Maze(7, 4)
+        for x in range(1, 6):
+            maze.set_cell(x, 1, 0)
+        maze.set_cell(3, 2, 0)
+        planner = CooperativePlanner(maze, [(1, 1), (5, 1)], [(5, 1), (1, 1)])
+        self.assertLess(planner.run(20), 20)
+        self.assertEqual(planner.positions, [(5, 1), (1, 1)])
+        
+        # Open rooms with scattered pillars, crowded with agents
+        rng = random.Random(5)
+        maze = Maze(15, 15)
+        for y in range(1, 14):
+            for x in range(1, 14):
+                if rng.random() < 0.8:
+                    maze.set_cell(x, y, 0)
+        maze.set_cell(7, 7, 0)
+        field = get_distance_field(maze, (7, 7))
+        cells = [(x, y) for y in range(15) for x in range(15) if field.distance(x, y) >= 0]
+        starts, goals = rng.sample(cells, 30), rng.sample(cells, 30)
+        planner = CooperativePlanner(maze, starts, goals, window=8)
+        for _ in range(200):
+            if not any(planner.active):
+                break
+            before = list(planner.positions)
+            moving = [agent for agent, active in enumerate(planner.active) if active]
+            planner.step()
+            occupied = {}
+            for agent in moving:
+                (x1, y1), (x2, y2) = before[agent], planner.positions[agent]
+                self.assertLessEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+                self.assertTrue(maze.is_path(x2, y2))
+                if planner.active[agent]:
+                    self.assertNotIn((x2, y2), occupied)
+                    occupied[(x2, y2)] = agent
+            for cell, agent in occupied.items():
+                # Nobody moved into this agent's old cell while it took theirs
+                other = occupied.get(before[agent])
+                if other is not None and other != agent:
+                    self.assertNotEqual(cell, before[other])
+            # Claims older than now are dropped
+            self.assertLessEqual(len(planner.table), len(moving) * (planner.window + 1))
+        self.assertFalse(any(planner.active))
+        self.assertEqual(planner.positions, goals)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -5,12 +5,21 @@ Tests for Maze Generation
 import unittest
 import sys
 import os
+import random
+import tempfile
+import itertools
+
+import numpy as np
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from maze.maze import Maze
 from maze.maze_generator import MazeGenerator
+from maze.packed_maze import BitPackedMaze
+from maze.maze_window import MazeWindow
+from maze.maze_io import save_maze, load_maze, read_header, MazeCache
+from ai.bfs import BFS
 
 class TestMaze(unittest.TestCase):
     def setUp(self):
@@ -68,6 +77,296 @@ class TestMaze(unittest.TestCase):
         
         for neighbor in expected:
             self.assertIn(neighbor, neighbors)
+    
+    def test_bulk_accessors(self):
+        """Test array views over the maze grid"""
+        self.maze.set_cell(2, 3, 0)
+        self.maze.set_cell(3, 3, 3)
+        
+        # Row and region views share storage with the maze
+        self.assertEqual(list(self.maze.get_row(3)[:4]), [1, 1, 0, 3])
+        region = self.maze.get_region(2, 3, 2, 1)
+        self.assertEqual(region.shape, (1, 2))
+        region[0, 0] = 1
+        self.assertTrue(self.maze.is_wall(2, 3))
+        
+        # Regions are clipped to the maze bounds
+        self.assertEqual(self.maze.get_region(8, 8, 5, 5).shape, (2, 2))
+        
+        mask = self.maze.passable_mask()
+        self.assertEqual(mask.dtype, bool)
+        self.assertEqual(int(mask.sum()), 1)
+        self.assertTrue(mask[3, 3])
+    
+    def test_neighbor_index(self):
+        """Test the compiled neighbor index against get_neighbors"""
+        maze = self.generator.generate_maze()
+        maze.build_neighbor_index()
+        
+        # Toggle a few cells after the index is built, it must be patched
+        maze.set_cell(1, 1, 1)
+        maze.set_cell(2, 1, 0)
+        maze.set_cell(0, 0, 0)
+        
+        for y in range(maze.height):
+            for x in range(maze.width):
+                self.assertEqual(maze.iter_neighbors(x, y), maze.get_neighbors(x, y))
+        
+        # Bulk writes drop the index so it is rebuilt on next use
+        maze.fill(0)
+        self.assertEqual(maze.iter_neighbors(0, 0), [(1, 0), (0, 1)])
+    
+    def test_bit_packed_maze(self):
+        """Test generating into and reading from a bit-packed maze"""
+        random.seed(7)
+        reference = MazeGenerator(21, 13).generate_maze()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            random.seed(7)
+            packed = BitPackedMaze(21, 13, path=os.path.join(tmp, "maze.bits"))
+            MazeGenerator(21, 13).generate_maze(maze=packed)
+            
+            # One bit per cell, rows padded to whole bytes
+            self.assertEqual(packed.bits.nbytes, 13 * 3)
+            self.assertTrue(np.array_equal(packed.get_region(0, 0, 21, 13), reference.grid))
+            self.assertEqual(packed.get_start_position(), reference.get_start_position())
+            
+            for y in range(packed.height):
+                for x in range(packed.width):
+                    self.assertEqual(packed.get_cell(x, y), reference.get_cell(x, y))
+                    self.assertEqual(packed.iter_neighbors(x, y), reference.get_neighbors(x, y))
+            
+            path = BFS(packed).find_path(packed.get_start_position(), packed.get_goal_position())
+            self.assertEqual(path[-1], packed.get_goal_position())
+            
+            # Writes keep a built neighbor index in step
+            packed.neighbor_masks()
+            packed.set_cell(2, 1, 0 if packed.get_cell(2, 1) == 1 else 1)
+            masks = bytes(packed.neighbor_masks())
+            self.assertEqual(masks, bytes(packed.build_neighbor_index()))
+            del packed, path
+    
+    def test_large_recursive_backtracking(self):
+        """Test backtracking generation well beyond the recursion limit"""
+        maze = MazeGenerator(301, 301).generate_maze("recursive_backtracking")
+        
+        # A perfect maze on the odd lattice opens every odd cell
+        self.assertTrue(maze.passable_mask()[1::2, 1::2].all())
+        self.assertIsNotNone(maze.get_goal_position())
+    
+    def test_streaming_generation(self):
+        """Test that streamed cells match the finished maze"""
+        maze = Maze(31, 21)
+        carved = list(MazeGenerator(31, 21).iter_generate(maze))
+        
+        # Every yielded cell is open, every open cell was yielded once
+        self.assertEqual(len(carved), len(set(carved)))
+        self.assertEqual(set(carved), {(x, y) for y in range(21) for x in range(31)
+                                       if not maze.is_wall(x, y)})
+        self.assertIsNotNone(maze.get_start_position())
+        
+        # Eller's streams rows; its cells match the batch generator's maze
+        maze = Maze(31, 21)
+        carved = list(MazeGenerator(31, 21, seed=2).iter_generate(maze, "eller"))
+        expected = MazeGenerator(31, 21, seed=2).generate_maze("eller")
+        self.assertTrue(np.array_equal(maze.passable_mask(), expected.passable_mask()))
+        self.assertEqual(set(carved), {(x, y) for y in range(21) for x in range(31)
+                                       if not expected.is_wall(x, y)})
+        
+        with self.assertRaises(ValueError):
+            list(MazeGenerator(31, 21).iter_generate(Maze(31, 21), "wilson"))
+    
+    def assert_perfect_maze(self, maze: Maze):
+        """Assert the open cells form a single loop-free tree over the odd lattice"""
+        open_cells = [(x, y) for y in range(maze.height) for x in range(maze.width)
+                      if not maze.is_wall(x, y)]
+        edges = sum(len(maze.get_neighbors(x, y)) for x, y in open_cells) // 2
+        reachable = BFS(maze).find_all_paths(open_cells[0])
+        
+        self.assertEqual(len(reachable), len(open_cells))
+        self.assertEqual(edges, len(open_cells) - 1)
+        self.assertTrue(maze.passable_mask()[1:maze.height - 1:2, 1:maze.width - 1:2].all())
+    
+    def test_kruskal_spanning_tree(self):
+        """Test that Kruskal carves a single loop-free tree"""
+        for width, height in [(21, 15), (10, 12)]:
+            maze = Maze(width, height)
+            MazeGenerator(width, height)._kruskal_algorithm(maze)
+            self.assert_perfect_maze(maze)
+    
+    def test_prim_spanning_tree(self):
+        """Test that Prim carves the whole maze, not just its start cell"""
+        for width, height in [(21, 15), (31, 31)]:
+            maze = MazeGenerator(width, height).generate_maze("prim")
+            self.assertIsNotNone(maze.get_goal_position())
+            maze.clear_paths()
+            self.assert_perfect_maze(maze)
+    
+    def test_eller_generation(self):
+        """Test the finite Eller's mode produces a perfect maze"""
+        for width, height in [(21, 15), (20, 16)]:
+            maze = MazeGenerator(width, height).generate_maze("eller")
+            self.assertIsNotNone(maze.get_goal_position())
+            maze.clear_paths()
+            self.assert_perfect_maze(maze)
+    
+    def test_maze_window(self):
+        """Test the sliding window over an endless Eller's row stream"""
+        random.seed(3)
+        rows = list(itertools.islice(MazeGenerator(15, 1).iter_eller_rows(), 60))
+        random.seed(3)
+        window = MazeWindow(MazeGenerator(15, 1).iter_eller_rows(), 15, 9)
+        
+        window.advance(20)
+        window.keep_in_view(35, margin=2)
+        self.assertEqual(window.row_range(), (29, 38))
+        
+        # Absolute coordinates inside the band, walls outside it
+        for y in range(window.top, window.top + window.height):
+            self.assertEqual(list(window.get_row(y)), list(rows[y]))
+        self.assertTrue(window.is_wall(1, 10))
+        self.assertFalse(window.in_bounds(1, 38))
+        
+        # Solvers only ever see cells inside the band
+        start = (int(np.flatnonzero(rows[31] == 0)[0]), 31)
+        for x, y in BFS(window).find_all_paths(start):
+            self.assertTrue(window.in_bounds(x, y))
+            self.assertEqual(window.iter_neighbors(x, y), window.get_neighbors(x, y))
+    
+    def test_max_difficulty_placement(self):
+        """Test start and goal end up at the ends of the longest shortest path"""
+        maze = MazeGenerator(41, 31).generate_maze(placement="max_difficulty")
+        start, goal = maze.get_start_position(), maze.get_goal_position()
+        
+        paths = BFS(maze).find_all_paths(start)
+        longest = max(len(path) for path in paths.values())
+        self.assertEqual(len(paths[goal]), longest)
+        
+        # Nothing is farther from the goal either
+        paths = BFS(maze).find_all_paths(goal)
+        self.assertEqual(max(len(path) for path in paths.values()), longest)
+    
+    def test_generate_many_deterministic(self):
+        """Test batch generation gives the same mazes for the same seeds"""
+        generator = MazeGenerator(21, 21)
+        seeds = [11, 12, 13, 11]
+        
+        serial = list(generator.generate_many(4, seeds=seeds, workers=1))
+        parallel = dict(generator.generate_many(4, seeds=seeds, workers=2))
+        
+        self.assertEqual([seed for seed, _ in serial], seeds)
+        for seed, maze in serial:
+            self.assertTrue(np.array_equal(maze.grid, parallel[seed].grid))
+            self.assertEqual(maze.get_goal_position(), parallel[seed].get_goal_position())
+        
+        # Duplicate seeds give identical mazes, different seeds do not
+        self.assertTrue(np.array_equal(serial[0][1].grid, serial[3][1].grid))
+        self.assertFalse(np.array_equal(serial[0][1].grid, serial[1][1].grid))
+        
+        with self.assertRaises(ValueError):
+            list(generator.generate_many(3, seeds=seeds))
+    
+    def test_save_and_load(self):
+        """Test the binary maze format round trip"""
+        maze = MazeGenerator(23, 17).generate_maze(seed=5)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.maze")
+            save_maze(maze, path, "recursive_backtracking", 5)
+            
+            # 64-byte header plus 3 bytes per row
+            self.assertEqual(os.path.getsize(path), 64 + 17 * 3)
+            header = read_header(path)
+            self.assertEqual((header.generator, header.seed), ("recursive_backtracking", 5))
+            
+            loaded = load_maze(path)
+            self.assertTrue(np.array_equal(loaded.get_region(0, 0, 23, 17), maze.grid))
+            self.assertEqual(loaded.get_start_position(), maze.get_start_position())
+            self.assertEqual(loaded.get_goal_position(), maze.get_goal_position())
+            
+            # Copy-on-write: edits stay in memory
+            loaded.set_cell(1, 1, 1)
+            self.assertTrue(np.array_equal(load_maze(path).get_region(0, 0, 23, 17), maze.grid))
+            del loaded
+            
+            # Headers that cannot hold the seed or name are refused before writing
+            other = os.path.join(tmp, "other.maze")
+            for generator, seed in (("prim", 2 ** 63), ("prim", -2 ** 63 - 1), ("é" * 13, 1)):
+                with self.assertRaises(ValueError):
+                    save_maze(maze, other, generator, seed)
+            self.assertFalse(os.path.exists(other))
+            save_maze(maze, other, "é" * 12, -2 ** 63)
+            header = read_header(other)
+            self.assertEqual((header.generator, header.seed), ("é" * 12, -2 ** 63))
+    
+    def test_maze_cache(self):
+        """Test cached generation and size-based eviction"""
+        with tempfile.TemporaryDirectory() as tmp:
+            # Room for two 41x41 mazes (64 + 41 * 6 bytes each)
+            cache = MazeCache(tmp, max_bytes=2 * 310)
+            generator = MazeGenerator(41, 41, cache=cache)
+            
+            first = generator.generate_maze(seed=1)
+            cached = generator.generate_maze(seed=1)
+            self.assertIs(type(cached), Maze)
+            self.assertTrue(np.array_equal(cached.grid, first.grid))
+            self.assertEqual(cached.get_start_position(), first.get_start_position())
+            self.assertEqual(cached.get_goal_position(), first.get_goal_position())
+            
+            generator.generate_maze(seed=2)
+            os.utime(cache.path_for(41, 41, "recursive_backtracking", 1), (0, 0))
+            generator.generate_maze(seed=3)
+            
+            # The least recently used entry went first
+            self.assertEqual(sorted(os.listdir(tmp)), [
+                "41x41-recursive_backtracking-corners-2.maze",
+                "41x41-recursive_backtracking-corners-3.maze",
+            ])
+    
+    def test_version_counter(self):
+        """Test that the version only moves when passability may change"""
+        for maze in (Maze(8, 8), BitPackedMaze(8, 8)):
+            version = maze.version
+            maze.set_cell(1, 1, 1)  # Already a wall
+            self.assertEqual(maze.version, version)
+            maze.set_cell(1, 1, 0)
+            self.assertGreater(maze.version, version)
+            
+            version = maze.version
+            maze.set_cell(1, 1, 2)  # Marker on an open cell
+            self.assertEqual(maze.version, version)
+            maze.set_cells(np.array([2, 3]), np.array([2, 2]), 0)
+            self.assertGreater(maze.version, version)
+            
+            # The neighbor index follows edits on both storage layouts
+            masks = bytes(maze.neighbor_masks())
+            maze.set_cell(2, 1, 0)
+            self.assertNotEqual(bytes(maze.neighbor_masks()), masks)
+            self.assertIn((2, 1), maze.iter_neighbors(2, 2))
+    
+    def test_change_log(self):
+        """Test that tracked mazes list the cells changed since a version"""
+        maze = Maze(6, 6)
+        version = maze.version
+        maze.set_cell(1, 1, 0)
+        self.assertIsNone(maze.changes_since(version))  # Not tracking yet
+        
+        maze.track_changes()
+        version = maze.version
+        maze.set_cell(2, 1, 0)
+        maze.set_cell(2, 1, 2)  # Marker only, no change
+        maze.set_cell(3, 1, 0)
+        self.assertEqual(maze.changes_since(version), [(2, 1), (3, 1)])
+        self.assertEqual(maze.changes_since(maze.version), [])
+        maze.set_row(4, np.zeros(6, dtype=np.uint8))
+        self.assertIsNone(maze.changes_since(version))
+        
+        window = MazeWindow(iter([np.zeros(4, dtype=np.uint8)] * 10), 4, 3)
+        window.track_changes()
+        window.advance(2)
+        version = window.version
+        window.set_cell(1, 3, 1)
+        self.assertEqual(window.changes_since(version), [(1, 3)])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file